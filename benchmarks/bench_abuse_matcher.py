@@ -0,0 +1,70 @@
+"""Abuse matcher vs the legacy BANNED_REGEX alternation on 10k-message corpora.
+
+Run from the repo root: python -m benchmarks.bench_abuse_matcher
+"""
+import re
+import random
+import time
+
+from zenith_group_bot.filters import AbuseMatcher
+from zenith_group_bot.word_list import BANNED_WORDS
+
+CORPUS_SIZE = 10_000
+LIST_SCALES = (1, 4, 16)
+
+_VOCAB = (
+    "hello team the exam is tomorrow please share notes class assignment link group "
+    "thanks bro what time meeting admin rules syllabus physics chapter lecture pdf ok "
+    "good morning everyone anyone solved question five deadline extended lab report"
+).split()
+
+def _obfuscate(word: str, rng: random.Random) -> str:
+    style = rng.randrange(4)
+    if style == 0: return ".".join(word)
+    if style == 1: return word[0] + word[1] * 4 + word[2:] if len(word) > 2 else word
+    if style == 2: return word.replace("i", "1").replace("o", "0").replace("s", "$")
+    return word.replace("a", "а").replace("o", "о").replace("c", "с")  # Cyrillic lookalikes
+
+def build_corpus(rng: random.Random) -> list[str]:
+    plain = [w for w in BANNED_WORDS if w.isascii() and " " not in w and "-" not in w]
+    corpus = []
+    for _ in range(CORPUS_SIZE):
+        words = rng.choices(_VOCAB, k=rng.randint(4, 30))
+        roll = rng.random()
+        if roll < 0.05: words.insert(rng.randrange(len(words)), rng.choice(plain))
+        elif roll < 0.10: words.insert(rng.randrange(len(words)), _obfuscate(rng.choice(plain), rng))
+        corpus.append(" ".join(words))
+    return corpus
+
+def legacy_regex(words):
+    return re.compile(r'\b(' + '|'.join(map(re.escape, words)) + r')\b', re.IGNORECASE)
+
+def padded_list(scale: int, rng: random.Random) -> list[str]:
+    filler = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(5, 10))) for _ in range(len(BANNED_WORDS) * (scale - 1))]
+    return BANNED_WORDS + filler
+
+def _time(fn, corpus) -> tuple[float, int]:
+    start = time.perf_counter()
+    hits = sum(1 for text in corpus if fn(text))
+    return time.perf_counter() - start, hits
+
+def main():
+    rng = random.Random(1337)
+    corpus = build_corpus(rng)
+    print(f"corpus: {len(corpus)} messages, {sum(map(len, corpus)) / len(corpus):.0f} chars avg")
+    print(f"{'words':>7} | {'regex ms':>9} {'hits':>5} | {'matcher ms':>10} {'hits':>5} | {'build ms':>8}")
+
+    for scale in LIST_SCALES:
+        words = padded_list(scale, rng)
+        regex = legacy_regex(words)
+
+        start = time.perf_counter()
+        matcher = AbuseMatcher(words)
+        build = time.perf_counter() - start
+
+        regex_time, regex_hits = _time(regex.search, corpus)
+        matcher_time, matcher_hits = _time(matcher.search, corpus)
+        print(f"{len(words):>7} | {regex_time * 1000:>9.1f} {regex_hits:>5} | {matcher_time * 1000:>10.1f} {matcher_hits:>5} | {build * 1000:>8.1f}")
+
+if __name__ == "__main__":
+    main()
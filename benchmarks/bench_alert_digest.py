@@ -0,0 +1,63 @@
+"""Owner DM volume during a replayed raid: one DM per violation vs per-owner digests.
+
+Three owners with ten groups between them take a burst of violations from a pool of
+raiders; every third strike on a user is a ban, which still goes out immediately.
+
+Run from the repo root: python -m benchmarks.bench_alert_digest
+"""
+import random
+import asyncio
+
+from zenith_group_bot.alert_digest import AlertDigest
+from zenith_group_bot.outbound import outbound, OWNER_DM
+
+VIOLATIONS = 3000
+DURATION = 3.0
+OWNERS = {1: 5, 2: 3, 3: 2}  # owner_id -> groups owned
+RAIDERS = 400
+REASONS = ("Abusive Language Detected", "Message Flooding (Spamming)")
+
+class CountingBot:
+    def __init__(self):
+        self.sent = 0
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.sent += 1
+        await asyncio.sleep(0.01)
+        return text
+
+def replay(seed: int = 7):
+    rng = random.Random(seed)
+    groups = [(owner_id, -1000 * owner_id - i) for owner_id, count in OWNERS.items() for i in range(count)]
+    strikes = {}
+    for _ in range(VIOLATIONS):
+        owner_id, chat_id = rng.choice(groups)
+        user = f"raider{rng.randrange(RAIDERS)}"
+        strikes[(chat_id, user)] = strikes.get((chat_id, user), 0) + 1
+        yield owner_id, chat_id, user, rng.choice(REASONS), strikes[(chat_id, user)]
+
+async def run(digest: AlertDigest | None) -> int:
+    bot = CountingBot()
+    for owner_id, chat_id, user, reason, strike in replay():
+        action = "BANNED USER" if strike >= 3 else f"Deleted Message (Strike {strike})"
+        if digest is None or strike >= 3:
+            outbound.submit(OWNER_DM, owner_id, lambda o=owner_id: bot.send_message(chat_id=o, text="alert"))
+        else:
+            digest.add(bot, chat_id, owner_id, f"Group {chat_id}", user, reason, action)
+        await asyncio.sleep(DURATION / VIOLATIONS)
+    if digest: await digest.flush_all()
+    return bot.sent
+
+async def main():
+    # Owner DMs here bypass Telegram's real limits; only the count of send_message calls matters
+    outbound.global_bucket.rate = outbound.global_bucket.burst = 1e9
+    outbound.chat_rate = outbound.chat_burst = 1e9
+    per_violation = await run(None)
+    digested = await run(AlertDigest(interval=1.0, max_events=50))
+    print(f"{VIOLATIONS} violations across {sum(OWNERS.values())} groups / {len(OWNERS)} owners")
+    print(f"  one DM per violation: {per_violation:>5} send_message calls")
+    print(f"  digests (1s / 50 ev): {digested:>5} send_message calls ({per_violation / digested:.0f}x fewer)")
+    await outbound.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+"""Cost and hit rate of the cross-user duplicate detector on a mixed chat stream.
+
+Normal chat from benchmarks/streams.py is interleaved with copy-paste bursts where each
+account swaps a word or two. Reports ns per check (tokenizing is timed apart, since the
+abuse check has already done it for the same text), the share of raid copies removed, and
+false positives among normal messages.
+
+Run from the repo root: python -m benchmarks.bench_duplicates
+"""
+import time
+
+from zenith_group_bot.duplicate_guard import DuplicateGuard, DUPLICATE_LIMITS
+from zenith_group_bot.filters import tokenize
+from benchmarks.streams import StreamBuilder, mixed_stream
+
+CHATS = 200
+UPDATES = 200_000
+
+def main():
+    builder = StreamBuilder([-1001000000000 - i for i in range(CHATS)], seed=7)
+    mix = {"chat": 0.9, "copypaste": 0.1}
+    stream = [(scenario, u["message"]) for scenario, u in mixed_stream(builder, UPDATES, mix)]
+
+    for strength in ("low", "medium", "strict"):
+        guard, limits = DuplicateGuard(), DUPLICATE_LIMITS[strength]
+        caught = {"chat": 0, "copypaste": 0}
+        totals = {"chat": 0, "copypaste": 0}
+        fold = check = 0.0
+        # Messages arrive ~2ms apart so bursts land inside the window but old chatter ages out
+        for i, (scenario, msg) in enumerate(stream):
+            # The abuse check folds each message first; the guard reuses its cached tokens
+            t0 = time.perf_counter()
+            tokenize(msg["text"])
+            t1 = time.perf_counter()
+            raid, earlier = guard.check(msg["chat"]["id"], msg["from"]["id"], msg["message_id"], msg["text"], limits, now=i * 0.002)
+            t2 = time.perf_counter()
+            fold, check = fold + t1 - t0, check + t2 - t1
+            totals[scenario] += 1
+            caught[scenario] += raid + len(earlier)
+        print(f"{strength:<7} {check / len(stream) * 1e9:>7.0f} ns/check (+{fold / len(stream) * 1e9:.0f} ns shared tokenize)"
+              f"   raid copies removed {caught['copypaste'] / totals['copypaste']:6.1%}"
+              f"   normal messages flagged {caught['chat']} of {totals['chat']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Delete latency under rising violation load: inline calls vs the outbound scheduler.
+
+Each violation issues what group_monitor_handler does: delete, an in-chat warning and
+an owner DM. The inline baseline handles updates one at a time (python-telegram-bot's
+default, which the group bot used before); the scheduler run handles them concurrently
+as group_app now does. Latency is measured from an update's arrival to its delete completing. The fake bot
+answers after a fixed latency and enforces Telegram-like send limits (30 msg/s overall,
+20 msg/min per chat) by raising RetryAfter.
+
+Run from the repo root: python -m benchmarks.bench_outbound
+"""
+import time
+import random
+import asyncio
+from collections import deque
+
+from telegram.error import RetryAfter
+
+from zenith_group_bot.outbound import OutboundScheduler, ENFORCE, WARNING, OWNER_DM
+
+CALL_LATENCY = 0.03
+DURATION = 2.0
+RATES = (10, 50, 150, 300)
+CHATS = 20
+
+class FakeBot:
+    def __init__(self):
+        self.sends = deque()
+        self.chat_sends = {}
+        self.calls = 0
+        self.rejected = 0
+
+    async def _call(self):
+        self.calls += 1
+        await asyncio.sleep(CALL_LATENCY)
+
+    async def delete_message(self, chat_id, message_id):
+        await self._call()
+        return True
+
+    async def send_message(self, chat_id, text):
+        await self._call()
+        now = time.monotonic()
+        while self.sends and now - self.sends[0] > 1: self.sends.popleft()
+        per_chat = self.chat_sends.setdefault(chat_id, deque())
+        while per_chat and now - per_chat[0] > 60: per_chat.popleft()
+        if len(self.sends) >= 30 or len(per_chat) >= 20:
+            self.rejected += 1
+            raise RetryAfter(1)
+        self.sends.append(now)
+        per_chat.append(now)
+        return text
+
+async def inline_violation(bot, scheduler, chat_id, owner_id, arrived, latencies):
+    """The pre-scheduler handler body: every call awaited in line."""
+    try:
+        await bot.delete_message(chat_id, 1)
+        latencies.append(time.monotonic() - arrived)
+        await bot.send_message(chat_id, "warning")
+        await bot.send_message(owner_id, "alert")
+    except RetryAfter:
+        pass
+
+async def scheduled_violation(bot, scheduler, chat_id, owner_id, arrived, latencies):
+    await scheduler.submit(ENFORCE, chat_id, lambda: bot.delete_message(chat_id, 1))
+    latencies.append(time.monotonic() - arrived)
+    scheduler.submit(WARNING, chat_id, lambda: bot.send_message(chat_id, "warning"), ("alert", chat_id))
+    scheduler.submit(OWNER_DM, owner_id, lambda: bot.send_message(owner_id, "alert"))
+
+async def run(rate: int, scheduled: bool) -> tuple[list[float], FakeBot, dict]:
+    bot, latencies, updates = FakeBot(), [], asyncio.Queue()
+    scheduler = OutboundScheduler() if scheduled else None
+    handler = scheduled_violation if scheduled else inline_violation
+
+    async def handle(chat_id, arrived):
+        await handler(bot, scheduler, chat_id, 1, arrived, latencies)
+        updates.task_done()
+
+    async def dispatcher():
+        while True:
+            chat_id, arrived = await updates.get()
+            if scheduled: asyncio.create_task(handle(chat_id, arrived))
+            else: await handle(chat_id, arrived)
+
+    consumer = asyncio.create_task(dispatcher())
+    rng = random.Random(rate)
+    for _ in range(int(rate * DURATION)):
+        updates.put_nowait((-1000 - rng.randrange(CHATS), time.monotonic()))
+        await asyncio.sleep(1 / rate)
+    await updates.join()
+    consumer.cancel()
+    stats = scheduler.stats if scheduled else {}
+    if scheduled: await scheduler.stop()
+    return sorted(latencies), bot, stats
+
+def _pct(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+async def main():
+    print(f"{'rate/s':>6} | {'mode':>9} | {'delete p50':>10} {'p99':>7} | {'api calls':>9} {'429s':>5} | shed")
+    for rate in RATES:
+        for scheduled in (False, True):
+            latencies, bot, stats = await run(rate, scheduled)
+            shed = f"{stats['dropped']} dropped, {stats['collapsed']} collapsed" if stats else "-"
+            print(f"{rate:>6} | {'scheduler' if scheduled else 'inline':>9} | {_pct(latencies, 0.5):>8.0f}ms {_pct(latencies, 0.99):>5.0f}ms | "
+                  f"{bot.calls:>9} {bot.rejected:>5} | {shed}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
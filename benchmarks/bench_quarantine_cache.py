@@ -0,0 +1,54 @@
+"""Memory and hit ratio of the quarantine cache with 1M tracked members.
+
+Run from the repo root: python -m benchmarks.bench_quarantine_cache
+"""
+import random
+import time
+import tracemalloc
+
+from cachetools import TTLCache
+
+MEMBERS = 1_000_000
+CHATS = 5_000
+LOOKUPS = 500_000
+
+def _members(rng: random.Random) -> list[tuple[int, int]]:
+    return [(-1001000000000 - rng.randrange(CHATS), rng.randrange(10**9, 8 * 10**9)) for _ in range(MEMBERS)]
+
+def measure_memory(members, key_fn, value) -> float:
+    tracemalloc.start()
+    cache = TTLCache(maxsize=MEMBERS, ttl=3600)
+    for chat_id, user_id in members:
+        cache[key_fn(chat_id, user_id)] = value
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / MEMBERS
+
+def measure_hit_ratio(members, maxsize: int, rng: random.Random) -> tuple[float, float]:
+    """Chatty-newcomer workload: a power-law share of members sends most messages."""
+    cache = TTLCache(maxsize=maxsize, ttl=3600)
+    expires = time.time() + 86400
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        key = members[min(int(rng.paretovariate(1.2)) - 1, MEMBERS - 1)] if rng.random() < 0.8 else rng.choice(members)
+        if cache.get(key) is not None: hits += 1
+        else: cache[key] = expires
+    return hits / LOOKUPS, (time.perf_counter() - start) / LOOKUPS * 1e6
+
+def main():
+    rng = random.Random(7)
+    members = _members(rng)
+    expiry = time.time() + 86400
+
+    legacy = measure_memory(members, lambda c, u: f"{c}_{u}", "CLEARED")
+    compact = measure_memory(members, lambda c, u: (c, u), expiry)
+    print(f"{MEMBERS:,} entries: legacy str keys {legacy:.0f} B/entry ({legacy * MEMBERS / 2**20:.0f} MiB), "
+          f"tuple keys + expiry {compact:.0f} B/entry ({compact * MEMBERS / 2**20:.0f} MiB)")
+
+    for maxsize in (50_000, 200_000, 1_000_000):
+        ratio, per_lookup = measure_hit_ratio(members, maxsize, rng)
+        print(f"maxsize {maxsize:>9,}: hit ratio {ratio:6.1%}, {per_lookup:.2f} us/lookup")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Moderation throughput with 1, 2 and 4 group-bot shards behind one ShardRouter.
+
+Each worker runs the CPU-bound part of group_monitor_handler (abuse matching and the
+flood window) on the update JSON it is routed; Telegram and Postgres are left out.
+Scaling is bounded by the cores available here, which is printed first.
+
+Run from the repo root: python -m benchmarks.bench_sharding
+"""
+import os
+import time
+import random
+import asyncio
+import multiprocessing
+
+from zenith_group_bot.sharding import ShardRouter
+from zenith_group_bot.word_list import BANNED_WORDS
+
+UPDATES = 60_000
+CHATS = 500
+SHARD_COUNTS = (1, 2, 4)
+
+def _moderate(index: int, count: int, queue, results):
+    # Imported in the worker, as run_group_shard does
+    from zenith_group_bot.filters import ABUSE_MATCHER
+    from zenith_group_bot.flood_control import flood_engine
+    from zenith_group_bot.sharding import drain, configure
+    configure(index, count)
+    seen = {"n": 0, "flagged": 0}
+
+    def handle(data):
+        msg = data["message"]
+        flagged = ABUSE_MATCHER.search(msg["text"]) or flood_engine.hit(msg["chat"]["id"], msg["from"]["id"], 5, 3.0, time.monotonic())
+        seen["n"] += 1
+        seen["flagged"] += bool(flagged)
+
+    asyncio.run(drain(queue, handle))
+    results.put((index, seen["n"], seen["flagged"]))
+
+def _updates(seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    words = ["hello", "everyone", "check", "this", "out", "today", "group", "meeting", "link", "thanks"]
+    banned = list(BANNED_WORDS)
+    updates = []
+    for update_id in range(UPDATES):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(6, 30)))
+        if rng.random() < 0.05: text += " " + rng.choice(banned)
+        chat_id = -1001000000000 - rng.randrange(CHATS)
+        updates.append({"update_id": update_id, "message": {
+            "message_id": update_id, "date": 0, "text": text,
+            "chat": {"id": chat_id, "type": "supergroup"},
+            "from": {"id": rng.randrange(10**6, 10**7), "is_bot": False, "first_name": "u"},
+        }})
+    return updates
+
+async def run(shards: int, updates: list[dict]) -> tuple[float, list]:
+    results = multiprocessing.get_context("spawn").Queue()
+    router = ShardRouter(shards, _moderate, (results,))
+    router.start()
+    await asyncio.sleep(2.0)  # let the workers import and reach their queue before timing
+    start = time.perf_counter()
+    for i, data in enumerate(updates):
+        router.route(data)
+        if i % 1000 == 999: await asyncio.sleep(0)
+    await router.stop(timeout=120)
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted(results.get() for _ in range(shards))
+
+async def main():
+    print(f"cores available: {os.cpu_count()}")
+    updates = _updates()
+    baseline = None
+    for shards in SHARD_COUNTS:
+        elapsed, per_shard = await run(shards, updates)
+        rate = len(updates) / elapsed
+        baseline = baseline or rate
+        split = " / ".join(str(n) for _, n, _ in per_shard)
+        print(f"{shards} shard(s): {rate:>9,.0f} updates/s  ({rate / baseline:.2f}x)  per-shard: {split}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""Synthetic group-bot update streams for the replay benchmarks.
+
+Every generator yields Telegram update JSON (dicts), so streams can be replayed through
+the real handlers, POSTed to the webhook server, or fed to the shard router alike.
+"""
+import random
+from itertools import count, accumulate
+
+from zenith_group_bot.word_list import BANNED_WORDS
+
+_WORDS = ("hello", "everyone", "check", "this", "out", "today", "meeting", "link", "thanks", "who",
+          "is", "coming", "tonight", "great", "idea", "agreed", "lol", "see", "you", "later")
+# Chat text draws from a Zipf-like vocabulary: the common words above, then a long tail of
+# letter-only filler words ("zq" prefix keeps them clear of the banned list)
+_VOCAB = _WORDS + tuple("zq" + "".join(chr(97 + i // 26 ** k % 26) for k in range(3)) for i in range(5000))
+_VOCAB_WEIGHTS = list(accumulate(1 / rank for rank in range(1, len(_VOCAB) + 1)))
+
+# Approximate share of updates per scenario in mixed_stream()
+DEFAULT_MIX = {"chat": 0.66, "abuse": 0.10, "album": 0.06, "flood": 0.08, "raid": 0.06, "copypaste": 0.04}
+# Mean updates per burst, to turn update shares into burst weights
+_BURST_SIZE = {"chat": 1, "abuse": 1, "album": 6, "flood": 9, "raid": 31, "copypaste": 10}
+
+class StreamBuilder:
+    def __init__(self, chats: list[int], seed: int = 1):
+        self.chats = chats
+        self.rng = random.Random(seed)
+        self._update_ids = count(1)
+        self._message_ids = count(1)
+        self._user_ids = count(10**8)
+        self._albums = count(1)
+        self.members = {chat_id: [next(self._user_ids) for _ in range(50)] for chat_id in chats}
+
+    def _message(self, chat_id: int, user_id: int, **fields) -> dict:
+        return {"update_id": next(self._update_ids), "message": {
+            "message_id": next(self._message_ids), "date": 1700000000,
+            "chat": {"id": chat_id, "type": "supergroup", "title": f"Bench {chat_id}"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "u", "username": f"user{user_id}"},
+            **fields,
+        }}
+
+    def _text(self, words: int) -> str:
+        return " ".join(self.rng.choices(_VOCAB, cum_weights=_VOCAB_WEIGHTS, k=words))
+
+    def chat(self, chat_id: int):
+        yield self._message(chat_id, self.rng.choice(self.members[chat_id]), text=self._text(self.rng.randint(3, 25)))
+
+    def abuse(self, chat_id: int):
+        text = f"{self._text(self.rng.randint(2, 10))} {self.rng.choice(BANNED_WORDS)} {self._text(2)}"
+        yield self._message(chat_id, self.rng.choice(self.members[chat_id]), text=text)
+
+    def album(self, chat_id: int):
+        user_id, album = self.rng.choice(self.members[chat_id]), f"album{next(self._albums)}"
+        for i in range(self.rng.randint(2, 10)):
+            photo = [{"file_id": f"{album}-{i}", "file_unique_id": f"{album}-{i}", "width": 90, "height": 90}]
+            yield self._message(chat_id, user_id, photo=photo, media_group_id=album, **({"caption": self._text(4)} if i == 0 else {}))
+
+    def flood(self, chat_id: int):
+        user_id = self.rng.choice(self.members[chat_id])
+        for _ in range(self.rng.randint(6, 12)):
+            yield self._message(chat_id, user_id, text=self._text(2))
+
+    def raid(self, chat_id: int):
+        """A wave of joins, then the raiders posting links."""
+        raiders = [next(self._user_ids) for _ in range(self.rng.randint(10, 40))]
+        for i in range(0, len(raiders), 5):
+            members = [{"id": uid, "is_bot": False, "first_name": "r", "username": f"raider{uid}"} for uid in raiders[i:i + 5]]
+            yield self._message(chat_id, raiders[i], new_chat_members=members)
+        for uid in raiders:
+            text = "join now https://spam.example"
+            yield self._message(chat_id, uid, text=text, entities=[{"type": "url", "offset": 9, "length": len(text) - 9}])
+
+    def copypaste(self, chat_id: int):
+        """Several existing members post one promo text, each with a word or two swapped."""
+        template = f"{self._text(6)} join now for free signals {self._text(4)}".split()
+        for user_id in self.rng.sample(self.members[chat_id], self.rng.randint(5, 15)):
+            words = template[:]
+            for _ in range(self.rng.randint(0, 2)): words[self.rng.randrange(len(words))] = self.rng.choice(_WORDS)
+            yield self._message(chat_id, user_id, text=" ".join(words))
+
+def mixed_stream(builder: StreamBuilder, updates: int, mix: dict = DEFAULT_MIX):
+    """About `updates` updates, drawn as scenario bursts across random chats."""
+    scenarios = list(mix)
+    weights = [mix[scenario] / _BURST_SIZE[scenario] for scenario in scenarios]
+    produced = 0
+    while produced < updates:
+        scenario = builder.rng.choices(scenarios, weights)[0]
+        for update in getattr(builder, scenario)(builder.rng.choice(builder.chats)):
+            yield scenario, update
+            produced += 1
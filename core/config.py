@@ -15,4 +15,69 @@ if DATABASE_URL:
         DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
\ No newline at end of file
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+
+# Raid mode: merge strikes for the same user/chat arriving within this window (0 = off)
+STRIKE_COALESCE_MS = int(os.getenv("STRIKE_COALESCE_MS", 0))
+
+# Raid mode: buffer joins across updates for this window before one bulk upsert (0 = per update)
+JOIN_BATCH_MS = int(os.getenv("JOIN_BATCH_MS", 0))
+
+# (chat_id, user_id) quarantine entries kept in memory; ~280 B each (1M is ~270 MiB)
+QUARANTINE_CACHE_SIZE = int(os.getenv("QUARANTINE_CACHE_SIZE", 200000))
+
+# Settings are invalidated across replicas via Postgres NOTIFY ("postgres"); "local" for a single process
+CACHE_BUS = os.getenv("CACHE_BUS", "postgres")
+SETTINGS_CACHE_TTL = int(os.getenv("SETTINGS_CACHE_TTL", 6 * 3600))
+SETTINGS_CACHE_SIZE = int(os.getenv("SETTINGS_CACHE_SIZE", 20000))
+
+# Per-chat admin lists, loaded once via get_chat_administrators and then kept current from chat_member updates
+ADMIN_ROSTER_TTL = int(os.getenv("ADMIN_ROSTER_TTL", 6 * 3600))  # backstop for changes made while the bot wasn't admin
+ADMIN_ROSTER_SIZE = int(os.getenv("ADMIN_ROSTER_SIZE", 20000))
+
+# Group bot writes its caches here on shutdown and reloads them on restart if younger than the max age ("" = off)
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", "")
+CACHE_SNAPSHOT_MAX_AGE = int(os.getenv("CACHE_SNAPSHOT_MAX_AGE", 600))
+
+# Owner alerts are batched into one digest DM per owner every interval, or sooner once this many events pile up
+ALERT_DIGEST_INTERVAL = float(os.getenv("ALERT_DIGEST_INTERVAL", 60))
+ALERT_DIGEST_MAX_EVENTS = int(os.getenv("ALERT_DIGEST_MAX_EVENTS", 50))
+
+# "polling" (default) or "webhook": one local HTTP server on WEBHOOK_PORT serves every bot in the process
+INGRESS_MODE = os.getenv("INGRESS_MODE", "polling")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # public base URL registered with Telegram ("" = serve locally only)
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", os.getenv("PORT", 8080)))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # required without WEBHOOK_URL; otherwise a random one is registered per run
+WEBHOOK_DEDUP_SIZE = int(os.getenv("WEBHOOK_DEDUP_SIZE", 10000))
+
+# Group bot worker processes; > 1 routes each chat (by chat_id % N) to one shard behind a single ingress
+GROUP_SHARDS = int(os.getenv("GROUP_SHARDS", 1))
+
+# Background purge of expired joins and decay of old strikes (see zenith_group_bot/maintenance.py)
+MAINTENANCE_INTERVAL = int(os.getenv("MAINTENANCE_INTERVAL", 600))
+MAINTENANCE_BATCH = int(os.getenv("MAINTENANCE_BATCH", 1000))
+MAINTENANCE_BUDGET = float(os.getenv("MAINTENANCE_BUDGET", 5.0))  # seconds of work per table per run
+STRIKE_DECAY_HOURS = int(os.getenv("STRIKE_DECAY_HOURS", 72))     # one strike forgiven per quiet period (0 = never)
+
+# Moderation event log: records buffered in memory (oldest dropped when full) and COPY'd in batches
+EVENT_LOG_CAPACITY = int(os.getenv("EVENT_LOG_CAPACITY", 20000))
+EVENT_LOG_FLUSH_SECONDS = float(os.getenv("EVENT_LOG_FLUSH_SECONDS", 2.0))
+EVENT_LOG_RETENTION_DAYS = int(os.getenv("EVENT_LOG_RETENTION_DAYS", 30))  # whole daily partitions are dropped after this
+
+# /stats rollups: per-chat hourly and daily counters, summed in memory and upserted every interval
+STATS_FLUSH_SECONDS = float(os.getenv("STATS_FLUSH_SECONDS", 30))
+STATS_HOURLY_RETENTION_DAYS = int(os.getenv("STATS_HOURLY_RETENTION_DAYS", 8))  # daily rows are kept
+
+# AI bot: globally banned users are held in memory; new bans are picked up every refresh, unbans on the full reload
+AI_BAN_REFRESH_SECONDS = int(os.getenv("AI_BAN_REFRESH_SECONDS", 15))
+AI_BAN_FULL_RELOAD_SECONDS = int(os.getenv("AI_BAN_FULL_RELOAD_SECONDS", 1800))
+
+# AI bot: answers stream into the placeholder with at most one edit per interval (3s minimum in groups; 0 = one edit at the end)
+AI_STREAM_EDIT_SECONDS = float(os.getenv("AI_STREAM_EDIT_SECONDS", 1.5))
+
+# Plain-text metrics endpoint (Prometheus format); group shards listen on METRICS_PORT + 1 + shard index (0 = off).
+# A standalone AI bot gets its own port; run in the group bot's process, it shares that endpoint.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9464))
+AI_METRICS_PORT = int(os.getenv("AI_METRICS_PORT", 9463))
@@ -0,0 +1,150 @@
+import time
+import asyncio
+from bisect import bisect_left
+
+from core.logger import setup_logger
+from core.config import METRICS_HOST, METRICS_PORT
+
+logger = setup_logger("METRICS")
+
+# Seconds; covers in-memory checks (tens of µs) up to slow LLM calls
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _label_text(labels: dict) -> str:
+    if not labels: return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+class Counter:
+    __slots__ = ("value",)
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def samples(self, name: str, labels: str):
+        yield f"{name}{labels} {self.value}"
+
+class Gauge:
+    """Set directly, or computed at scrape time when built with `fn`."""
+    __slots__ = ("value", "fn")
+    kind = "gauge"
+
+    def __init__(self, fn=None):
+        self.value, self.fn = 0, fn
+
+    def set(self, value: float):
+        self.value = value
+
+    def samples(self, name: str, labels: str):
+        yield f"{name}{labels} {self.fn() if self.fn else self.value}"
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+class Histogram:
+    """Fixed buckets: one bisect and two additions per observation."""
+    __slots__ = ("bounds", "counts", "sum", "count")
+    kind = "histogram"
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum, self.count = 0.0, 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def samples(self, name: str, labels: str):
+        base = labels[1:-1] + "," if labels else ""
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            yield f'{name}_bucket{{{base}le="{bound}"}} {running}'
+        yield f'{name}_bucket{{{base}le="+Inf"}} {self.count}'
+        yield f"{name}_sum{labels} {self.sum}"
+        yield f"{name}_count{labels} {self.count}"
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}  # name -> (kind, help, {label text: metric})
+
+    def _get(self, cls, name: str, help_text: str, labels: dict, **kwargs):
+        kind, _, series = self._metrics.setdefault(name, (cls.kind, help_text, {}))
+        if kind != cls.kind: raise ValueError(f"Metric {name} already registered as a {kind}")
+        key = _label_text(labels)
+        metric = series.get(key)
+        if metric is None: metric = series[key] = cls(**kwargs)
+        return metric
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str = "", fn=None, **labels) -> Gauge:
+        return self._get(Gauge, name, help_text, labels, fn=fn)
+
+    def histogram(self, name: str, help_text: str = "", bounds: tuple = LATENCY_BUCKETS, **labels) -> Histogram:
+        return self._get(Histogram, name, help_text, labels, bounds=bounds)
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for name, (kind, help_text, series) in sorted(self._metrics.items()):
+            if help_text: lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in series.items():
+                try: lines.extend(metric.samples(name, labels))
+                except Exception as e: logger.debug(f"Skipping {name}{labels}: {e}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+def ratio(hits: Counter, misses: Counter):
+    """Scrape-time hit ratio for a pair of counters, for use as a Gauge fn."""
+    return lambda: hits.value / (hits.value + misses.value) if hits.value + misses.value else 0.0
+
+_server = None
+
+async def start_metrics_server(port: int = METRICS_PORT, port_offset: int = 0):
+    """Serves registry.render() as text on METRICS_HOST:port (+offset per shard). Port 0 disables it."""
+    global _server
+    if _server is not None or not port: return
+    port += port_offset
+    try:
+        _server = await asyncio.start_server(_serve, METRICS_HOST, port)
+        logger.info(f"📈 Metrics on http://{METRICS_HOST}:{port}/metrics")
+    except OSError as e:
+        logger.warning(f"Metrics endpoint disabled, could not bind {METRICS_HOST}:{port}: {e}")
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""): pass
+        path = request_line.decode("latin-1").split(" ")[1] if request_line.count(b" ") >= 2 else ""
+        if path.split("?", 1)[0] in ("/", "/metrics"):
+            body, status = registry.render().encode(), "200 OK"
+        else:
+            body, status = b"", "404 Not Found"
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
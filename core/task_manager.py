@@ -20,4 +20,17 @@ async def supervised_task(name: str, coro_func):
         except Exception as e:
             logger.error(f"❌ {name} CRITICAL FAILURE: {e}. Restarting in {retry_delay}s...")
             await asyncio.sleep(retry_delay)
-            retry_delay = min(retry_delay * 2, 60)
\ No newline at end of file
+            retry_delay = min(retry_delay * 2, 60)
+
+async def periodic_task(name: str, job, interval: float, initial_delay: float = 60):
+    """Runs `job()` every `interval` seconds; a failed run is logged and retried next round."""
+    await asyncio.sleep(initial_delay)
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            logger.info(f"🛑 [SHUTDOWN] {name} task cancelled gracefully.")
+            break
+        except Exception as e:
+            logger.error(f"⚠️ {name} run failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,128 @@
+import json
+import asyncio
+import secrets
+from cachetools import LRUCache
+from telegram import Update
+
+from core.logger import setup_logger
+from core.config import (
+    INGRESS_MODE, WEBHOOK_URL, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_SECRET, WEBHOOK_DEDUP_SIZE,
+)
+
+logger = setup_logger("WEBHOOK")
+
+_MAX_BODY = 1 << 20
+_REASONS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+class _Route:
+    __slots__ = ("app", "seen")
+
+    def __init__(self, app):
+        self.app = app
+        self.seen = LRUCache(maxsize=WEBHOOK_DEDUP_SIZE)  # update_ids already queued; Telegram retries on slow replies
+
+class WebhookServer:
+    """Minimal asyncio HTTP/1.1 server that feeds Telegram webhook POSTs into each bot's update queue.
+
+    Every bot in the process registers a path (e.g. /group, /ai) and they all share one port.
+    Works without Telegram too: POST a recorded update JSON to http://localhost:PORT/<path>
+    with WEBHOOK_SECRET in the X-Telegram-Bot-Api-Secret-Token header.
+    """
+    def __init__(self):
+        self.secret = WEBHOOK_SECRET
+        self._routes = {}
+        self._server = None
+        self.stats = {"accepted": 0, "duplicates": 0, "rejected": 0}
+
+    async def register(self, path: str, app):
+        self._routes[path] = _Route(app)
+        if self._server is None:
+            self._server = await asyncio.start_server(self._serve, WEBHOOK_LISTEN, WEBHOOK_PORT)
+            logger.info(f"🌐 Webhook server listening on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}")
+
+    async def unregister(self, path: str):
+        self._routes.pop(path, None)
+        if not self._routes and self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > _MAX_BODY:
+                    await self._respond(writer, 413, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                await self._respond(writer, await self._handle(method, path, headers, body))
+                if headers.get("connection", "").lower() == "close": break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, method: str, path: str, headers: dict, body: bytes) -> int:
+        route = self._routes.get(path.split("?", 1)[0])
+        if route is None: return 404
+        if method != "POST": return 405
+        if not self.secret or not secrets.compare_digest(headers.get("x-telegram-bot-api-secret-token", ""), self.secret):
+            self.stats["rejected"] += 1
+            return 403
+        try:
+            data = json.loads(body)
+            update_id = data["update_id"]
+        except (ValueError, KeyError, TypeError):
+            return 400
+
+        if update_id in route.seen:
+            self.stats["duplicates"] += 1
+            return 200
+        try: update = Update.de_json(data, route.app.bot)
+        except Exception as e:
+            # Valid JSON that isn't an Update; not remembered, so it can't shadow a good retry
+            logger.warning(f"Malformed update {update_id} on {path}: {e!r}")
+            return 400
+        route.seen[update_id] = True
+        await route.app.update_queue.put(update)
+        self.stats["accepted"] += 1
+        return 200
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, close: bool = False):
+        head = f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Length: 0\r\n"
+        if close: head += "Connection: close\r\n"
+        writer.write(f"{head}\r\n".encode())
+        await writer.drain()
+
+webhook_server = WebhookServer()
+
+async def start_ingress(app, name: str):
+    """Starts receiving updates for an initialized and started Application (polling or webhook per INGRESS_MODE)."""
+    if INGRESS_MODE != "webhook":
+        # chat_member updates (admin changes) are only sent when asked for explicitly
+        return await app.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+    if not webhook_server.secret:
+        # Without a secret anyone who can reach the port could post forged updates (strikes, bans, admin changes)
+        if not WEBHOOK_URL: raise RuntimeError("INGRESS_MODE=webhook needs WEBHOOK_SECRET when the webhook is registered elsewhere")
+        webhook_server.secret = secrets.token_urlsafe(32)
+        logger.info("🔑 No WEBHOOK_SECRET set; registering a random one for this run")
+    await webhook_server.register(f"/{name}", app)
+    if WEBHOOK_URL:
+        await app.bot.set_webhook(url=f"{WEBHOOK_URL.rstrip('/')}/{name}", secret_token=webhook_server.secret, allowed_updates=Update.ALL_TYPES)
+    logger.info(f"📥 {name} receiving updates via webhook at /{name}")
+
+async def stop_ingress(app, name: str):
+    if INGRESS_MODE != "webhook":
+        if app.updater and app.updater.running: await app.updater.stop()
+        return
+    # The webhook stays registered with Telegram so updates queue up there while we restart
+    await webhook_server.unregister(f"/{name}")
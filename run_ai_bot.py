@@ -1,5 +1,5 @@
 import os
-import re
+import time
 import asyncio
 from uuid import uuid4
 from dotenv import load_dotenv
@@ -7,47 +7,31 @@ from telegram import Update, InlineQueryResultArticle, InputTextMessageContent
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, InlineQueryHandler, filters, ContextTypes
 
 from core.logger import setup_logger
-from core.config import AI_BOT_TOKEN
+from core.config import AI_BOT_TOKEN, AI_METRICS_PORT
+from core.webhook import start_ingress, stop_ingress
+from core.metrics import registry, start_metrics_server
 from zenith_ai_bot.llm_engine import process_ai_query, transcribe_voice
-from zenith_ai_bot.utils import check_ai_rate_limit, sanitize_telegram_html, is_file_allowed, extract_text_from_pdf, convert_ogg_to_wav, dispose_db_engine
+from zenith_ai_bot.streaming import StreamedReply
+from zenith_ai_bot.bans import global_bans
+from zenith_ai_bot.clients import clients
+from zenith_ai_bot.utils import check_ai_rate_limit, is_file_allowed, extract_text_from_pdf, convert_ogg_to_wav, dispose_db_engine
 
 load_dotenv()
 logger = setup_logger("AI_BOT")
 
 task_queue = asyncio.Queue()
+registry.gauge("zenith_ai_task_queue_depth", "AI requests waiting for a worker", fn=task_queue.qsize)
+_STAGES = {stage: registry.histogram("zenith_ai_stage_seconds", "Time per AI request stage", stage=stage) for stage in ("download", "extraction", "conversion", "transcription")}
 
 async def worker(app_context):
     while True:
         try:
-            update, context, placeholder_msg, text, image_bytes, history_text = await task_queue.get()
+            update, context, placeholder_msg, text, image_bytes, history_text, queued_at = await task_queue.get()
             
             try:
-                ai_response = await process_ai_query(text, image_bytes, history_text)
-                clean_html = sanitize_telegram_html(ai_response)
-                
-                # Safe Truncation
-                if len(clean_html) > 4000: 
-                    clean_html = clean_html[:4000] + "\n\n<i>[Truncated due to Telegram limits]</i>"
-                    
-                # 🚀 ATTEMPT 1: Send beautiful HTML
-                try:
-                    await context.bot.edit_message_text(
-                        chat_id=placeholder_msg.chat_id, 
-                        message_id=placeholder_msg.message_id, 
-                        text=clean_html, 
-                        parse_mode="HTML", 
-                        disable_web_page_preview=True
-                    )
-                except Exception as html_err:
-                    logger.warning(f"HTML Parse Error, engaging fallback: {html_err}")
-                    # 🚀 ATTEMPT 2: Fallback to plain text if HTML crashes
-                    plain_text = re.sub(r'<[^>]+>', '', clean_html) # Strip all HTML tags
-                    await context.bot.edit_message_text(
-                        chat_id=placeholder_msg.chat_id, 
-                        message_id=placeholder_msg.message_id, 
-                        text=plain_text, 
-                        disable_web_page_preview=True
-                    )
+                # The answer streams into the placeholder; the final edit keeps the plain-text fallback
+                reply = StreamedReply(context.bot, placeholder_msg, queued_at, private=update.effective_chat.type == "private")
+                await reply.run(process_ai_query(text, image_bytes, history_text))
 
             except Exception as e:
                 logger.error(f"Worker Error: {e}")
@@ -77,15 +61,15 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
     path = f"temp_{uuid4().hex}.pdf"
     
     try:
-        await file.download_to_drive(path)
-        text = await asyncio.to_thread(extract_text_from_pdf, path)
+        with _STAGES["download"].time(): await file.download_to_drive(path)
+        with _STAGES["extraction"].time(): text = await asyncio.to_thread(extract_text_from_pdf, path)
 
         if text == "ERROR:ENCRYPTED": return await placeholder.edit_text("🔒 This PDF is encrypted. I cannot read it.")
         if text == "ERROR:EMPTY": return await placeholder.edit_text("⚠️ This PDF contains no readable text (scanned image).")
         if text == "ERROR:BROKEN": return await placeholder.edit_text("❌ An error occurred parsing this PDF file.")
 
         user_query = caption.replace("/zenithai", "").strip() or "Please summarize this document."
-        await task_queue.put((update, context, placeholder, user_query, None, text))
+        await task_queue.put((update, context, placeholder, user_query, None, text, time.perf_counter()))
     finally:
         if os.path.exists(path): os.remove(path)
 
@@ -107,13 +91,13 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
     wav_path = ""
     
     try:
-        await file.download_to_drive(ogg_path)
-        wav_path = await asyncio.to_thread(convert_ogg_to_wav, ogg_path)
+        with _STAGES["download"].time(): await file.download_to_drive(ogg_path)
+        with _STAGES["conversion"].time(): wav_path = await asyncio.to_thread(convert_ogg_to_wav, ogg_path)
         
         if not wav_path:
             return await placeholder.edit_text("❌ Error converting audio file. (Missing FFmpeg)")
             
-        text = await transcribe_voice(wav_path)
+        with _STAGES["transcription"].time(): text = await transcribe_voice(wav_path)
         
         if text == "ERROR:GIBBERISH": return await placeholder.edit_text("⚠️ Audio quality too low to understand.")
         elif text.startswith("ERROR:"): return await placeholder.edit_text("📡 Audio transcription servers are offline.")
@@ -123,7 +107,7 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
             history_text = update.message.reply_to_message.text or update.message.reply_to_message.caption
 
         await placeholder.edit_text(f"📝 <b>Transcribed:</b> <i>\"{text}\"</i>\n\n🔍 <b>Researching...</b>", parse_mode="HTML")
-        await task_queue.put((update, context, placeholder, text, None, history_text))
+        await task_queue.put((update, context, placeholder, text, None, history_text, time.perf_counter()))
     finally:
         if os.path.exists(ogg_path): os.remove(ogg_path)
         if wav_path and os.path.exists(wav_path): os.remove(wav_path)
@@ -176,10 +160,10 @@ async def cmd_zenithai(update: Update, context: ContextTypes.DEFAULT_TYPE):
     image_bytes = None
     if photo_list:
         file = await context.bot.get_file(photo_list[-1].file_id)
-        image_bytes = await file.download_as_bytearray()
+        with _STAGES["download"].time(): image_bytes = await file.download_as_bytearray()
 
     placeholder = await msg.reply_text("⏳ Processing your research query...")
-    await task_queue.put((update, context, placeholder, text, image_bytes, history_text))
+    await task_queue.put((update, context, placeholder, text, image_bytes, history_text, time.perf_counter()))
 
 async def main():
     if not AI_BOT_TOKEN:
@@ -198,18 +182,21 @@ async def main():
 
     logger.info("🧠 ZENITH MULTIMODAL AGENT: ONLINE")
     try:
+        global_bans.start()
+        clients.start()
+        await start_metrics_server(AI_METRICS_PORT)
         await app.initialize()
         await app.start()
-        await app.updater.start_polling()
+        await start_ingress(app, "ai")
         await asyncio.Event().wait()
-    except asyncio.CancelledError:
-        pass
     finally:
         logger.info("🛑 Shutting down AI Bot Engine...")
         for w in workers: w.cancel()
-        await app.updater.stop()
+        await global_bans.stop()
+        await stop_ingress(app, "ai")
         await app.stop()
         await app.shutdown()
+        await clients.close()
         await dispose_db_engine()
 
 if __name__ == "__main__":
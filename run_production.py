@@ -1,17 +1,24 @@
 import asyncio
-from core.task_manager import supervised_task
+from core.task_manager import supervised_task, periodic_task
 from core.logger import setup_logger
-from zenith_group_bot.group_app import start_group_bot
+from core.config import INGRESS_MODE, AI_BOT_TOKEN, GROUP_SHARDS, MAINTENANCE_INTERVAL
+from zenith_group_bot.group_app import start_group_bot, start_sharded_group_bot
 from zenith_group_bot.repository import dispose_group_engine
+from zenith_group_bot.maintenance import run_maintenance
 
 logger = setup_logger("PRODUCTION")
 
 async def main():
     logger.info("🚀 ZENITH SUPREME EDITION: CLUSTER START")
     try:
-        await asyncio.gather(
-            supervised_task("GROUP_MONITOR", start_group_bot)
-        )
+        if GROUP_SHARDS > 1: services = [supervised_task("GROUP_INGRESS", start_sharded_group_bot)]
+        else: services = [supervised_task("GROUP_MONITOR", start_group_bot)]
+        services.append(periodic_task("GROUP_MAINTENANCE", run_maintenance, MAINTENANCE_INTERVAL))
+        if INGRESS_MODE == "webhook" and AI_BOT_TOKEN:
+            # Webhooks share one port, so both bots have to live in this process
+            from run_ai_bot import main as start_ai_bot
+            services.append(supervised_task("AI_AGENT", start_ai_bot))
+        await asyncio.gather(*services)
     except asyncio.CancelledError:
         logger.info("🛑 Task Gather Cancelled.")
     finally:
@@ -0,0 +1,35 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from telegram.error import NetworkError
+
+from zenith_group_bot.admin_roster import AdminRoster
+
+CHAT, ADMIN = -100123, 42
+
+class AdminRosterFailureTest(unittest.IsolatedAsyncioTestCase):
+    """A failed load only backs off the hot path; get() keeps asking Telegram and surfaces errors."""
+
+    async def asyncSetUp(self):
+        self.roster = AdminRoster(maxsize=10, ttl=600)
+        admin = SimpleNamespace(user=SimpleNamespace(id=ADMIN), status="administrator")
+        self.bot = SimpleNamespace(get_chat_administrators=mock.AsyncMock(side_effect=[NetworkError("timed out"), [admin]]))
+
+    async def test_get_raises_then_refetches(self):
+        with self.assertRaises(NetworkError): await self.roster.get(self.bot, CHAT)
+        self.assertIn(ADMIN, await self.roster.get(self.bot, CHAT))
+        self.assertEqual(self.bot.get_chat_administrators.await_count, 2)
+
+    async def test_is_admin_backs_off_after_failure(self):
+        self.assertFalse(self.roster.is_admin(self.bot, CHAT, ADMIN))
+        await asyncio.sleep(0)
+        self.assertFalse(self.roster.is_admin(self.bot, CHAT, ADMIN))
+        await asyncio.sleep(0)
+        self.assertEqual(self.bot.get_chat_administrators.await_count, 1)
+        self.assertIn(ADMIN, await self.roster.get(self.bot, CHAT))
+        self.assertTrue(self.roster.is_admin(self.bot, CHAT, ADMIN))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+from telegram import Update
+
+from zenith_group_bot.chat_order import ChatOrderedProcessor
+
+def _update(update_id: int, chat_id: int) -> Update:
+    return Update.de_json({"update_id": update_id, "message": {
+        "message_id": update_id, "date": 1700000000, "chat": {"id": chat_id, "type": "supergroup"}, "text": "hi"}}, None)
+
+class ChatOrderedProcessorTest(unittest.IsolatedAsyncioTestCase):
+    """Drives process_update the way Application does: one task per update, in arrival order."""
+
+    async def asyncSetUp(self):
+        self.processor = ChatOrderedProcessor(2)
+        self.done = []
+
+    async def _handle(self, update: Update, delay: float, fail: bool = False):
+        await asyncio.sleep(delay)
+        self.done.append((update.effective_chat.id, update.update_id))
+        if fail: raise RuntimeError("handler failed")
+
+    def _submit(self, update: Update, delay: float = 0.01, fail: bool = False) -> asyncio.Task:
+        return asyncio.create_task(self.processor.process_update(update, self._handle(update, delay, fail)))
+
+    async def test_each_chat_runs_in_arrival_order(self):
+        # Later updates finish faster, so any overlap within a chat would reorder them
+        tasks = [self._submit(_update(i, -1 - i % 2), delay=0.02 - i * 0.002) for i in range(8)]
+        await asyncio.gather(*tasks)
+        for chat in (-1, -2):
+            self.assertEqual([u for c, u in self.done if c == chat], sorted(u for c, u in self.done if c == chat))
+
+    async def test_burst_in_one_chat_holds_one_slot(self):
+        burst = [self._submit(_update(i, -1)) for i in range(10)]
+        await asyncio.sleep(0)
+        other = self._submit(_update(100, -2))
+        await asyncio.wait_for(other, 0.05)
+        self.assertLess(len(self.done), 10)
+        await asyncio.gather(*burst)
+
+    async def test_failed_update_does_not_stop_the_chat(self):
+        tasks = [self._submit(_update(i, -1), fail=i == 1) for i in range(3)]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertEqual([u for _, u in self.done], [0, 1, 2])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+
+from zenith_group_bot.filters import fold_text, is_inappropriate
+
+class NumericTextTest(unittest.IsolatedAsyncioTestCase):
+    """Plain numbers must never fold into the default word list; leetspeak inside words still must."""
+
+    async def test_numbers_are_not_banned_words(self):
+        for text in ("I scored 455/500", "Room 455 at 10am", "the answer is 4 5 5", "74771",
+                     "call me on 98 455 74771", "pin 5 5 3 7", "+91 7477 1455"):
+            self.assertEqual(await is_inappropriate(text), (False, ""), text)
+
+    def test_digit_runs_stay_apart(self):
+        self.assertEqual(fold_text("the answer is 4 5 5"), "the answer is 4 5 5")
+        self.assertEqual(fold_text("455/500"), "455 500")
+
+    async def test_leetspeak_in_words_still_matches(self):
+        for text in ("you a$$", "sh1t happens", "4ss", "a 5 5", "f.u.c.k off", "@$$hole"):
+            self.assertTrue((await is_inappropriate(text))[0], text)
+
+if __name__ == "__main__":
+    unittest.main()
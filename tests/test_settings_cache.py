@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from zenith_group_bot import repository
+from zenith_group_bot.repository import SettingsRepo, settings_cache, cache_bus
+
+class _Result:
+    def __init__(self, record):
+        self.record = record
+
+    def scalar_one_or_none(self):
+        return self.record
+
+class _Session:
+    """Answers SELECTs with db["row"]; while `gate` is set, each SELECT waits for it to open."""
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        pass
+
+    async def execute(self, stmt):
+        self.db["selects"] += 1
+        row = self.db["row"]  # the snapshot the query sees is taken when it starts
+        if self.db["gate"] is not None:
+            self.db["reading"].set()
+            await self.db["gate"].wait()
+        return _Result(row)
+
+class SettingsCacheInvalidationTest(unittest.IsolatedAsyncioTestCase):
+    """A peer's invalidation, played through the in-process CacheBus, must win over a read in flight."""
+    CHAT = -100123
+
+    def setUp(self):
+        settings_cache.clear()
+        self.db = {"row": SimpleNamespace(chat_id=self.CHAT, is_active=True), "selects": 0, "gate": None, "reading": asyncio.Event()}
+        patcher = mock.patch.object(repository, "AsyncSessionLocal", lambda: _Session(self.db))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(settings_cache.clear)
+
+    async def _read_across(self, invalidate):
+        """Starts a read, runs `invalidate` while its SELECT is in flight, then lets it finish."""
+        self.db["gate"] = asyncio.Event()
+        read = asyncio.create_task(SettingsRepo.get_settings(self.CHAT))
+        await self.db["reading"].wait()
+        self.db["row"] = SimpleNamespace(chat_id=self.CHAT, is_active=False)  # the peer's committed write
+        invalidate()
+        self.db["gate"].set()
+        stale = await read
+        self.db["gate"] = None
+        return stale
+
+    async def test_quiet_read_is_cached(self):
+        first = await SettingsRepo.get_settings(self.CHAT)
+        self.assertIs(await SettingsRepo.get_settings(self.CHAT), first)
+        self.assertEqual(self.db["selects"], 1)
+
+    async def test_invalidation_during_read_is_not_overwritten(self):
+        stale = await self._read_across(lambda: cache_bus.deliver("settings", self.CHAT))
+        self.assertTrue(stale.is_active)
+        self.assertNotIn(self.CHAT, settings_cache)
+        self.assertFalse((await SettingsRepo.get_settings(self.CHAT)).is_active)
+
+    async def test_clear_all_during_read_is_not_overwritten(self):
+        await self._read_across(cache_bus.deliver_all)
+        self.assertNotIn(self.CHAT, settings_cache)
+        self.assertFalse((await SettingsRepo.get_settings(self.CHAT)).is_active)
+
+    async def test_other_chat_invalidation_does_not_block_caching(self):
+        await self._read_across(lambda: cache_bus.deliver("settings", self.CHAT + 1))
+        self.assertIn(self.CHAT, settings_cache)
+
+if __name__ == "__main__":
+    unittest.main()
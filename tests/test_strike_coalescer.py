@@ -0,0 +1,31 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from zenith_group_bot.repository import StrikeCoalescer, GroupRepo
+
+class StrikeCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    """A caller that gives up must not leave the rest of its batch waiting."""
+    KEY = (7, -100123)
+
+    async def _batch_with_cancelled_caller(self, add_strikes):
+        coalescer = StrikeCoalescer(window_ms=10)
+        with mock.patch.object(GroupRepo, "add_strikes", add_strikes):
+            tasks = [asyncio.create_task(coalescer.submit(*self.KEY)) for _ in range(3)]
+            await asyncio.sleep(0)
+            tasks[1].cancel()
+            return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+
+    async def test_others_get_their_strike_numbers(self):
+        results = await self._batch_with_cancelled_caller(mock.AsyncMock(return_value={self.KEY: 4}))
+        self.assertEqual(results[0], 2)
+        self.assertIsInstance(results[1], asyncio.CancelledError)
+        self.assertEqual(results[2], 4)
+
+    async def test_others_get_the_error(self):
+        results = await self._batch_with_cancelled_caller(mock.AsyncMock(side_effect=RuntimeError("db down")))
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertIsInstance(results[2], RuntimeError)
+
+if __name__ == "__main__":
+    unittest.main()
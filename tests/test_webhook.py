@@ -0,0 +1,94 @@
+import json
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from core import webhook
+from core.webhook import WebhookServer, _Route, start_ingress
+
+_SECRET = "test-secret"
+_MESSAGE = {"message_id": 1, "date": 1700000000, "chat": {"id": -100123, "type": "supergroup"}, "text": "hi"}
+
+class WebhookServeTest(unittest.IsolatedAsyncioTestCase):
+    """Raw HTTP/1.1 against WebhookServer._serve on an ephemeral port, no web framework involved."""
+
+    async def asyncSetUp(self):
+        self.app = SimpleNamespace(update_queue=asyncio.Queue(), bot=None)
+        self.webhook = WebhookServer()
+        self.webhook.secret = _SECRET
+        self.webhook._routes["/group"] = _Route(self.app)
+        self.server = await asyncio.start_server(self.webhook._serve, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _post(self, payload, secret: str = _SECRET) -> int:
+        """Sends one POST /group on the shared keep-alive connection and returns the status code."""
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        head = f"POST /group HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        if secret is not None: head += f"X-Telegram-Bot-Api-Secret-Token: {secret}\r\n"
+        self.writer.write(f"{head}\r\n".encode() + body)
+        await self.writer.drain()
+        status_line = await asyncio.wait_for(self.reader.readline(), 5)
+        while (await self.reader.readline()) not in (b"\r\n", b"\n", b""): pass
+        return int(status_line.split()[1]) if status_line else 0
+
+    async def test_update_is_queued(self):
+        self.assertEqual(await self._post({"update_id": 1, "message": _MESSAGE}), 200)
+        self.assertEqual(self.app.update_queue.get_nowait().message.text, "hi")
+
+    async def test_malformed_updates_get_400_and_keep_the_connection(self):
+        for payload in (b"{not json", [1, 2], {"update_id": 2, "message": "oops"}, {"update_id": 3, "message": {"message_id": 1}}):
+            self.assertEqual(await self._post(payload), 400, payload)
+        self.assertTrue(self.app.update_queue.empty())
+        self.assertEqual(await self._post({"update_id": 4, "message": _MESSAGE}), 200)
+
+    async def test_rejected_update_is_not_remembered(self):
+        self.assertEqual(await self._post({"update_id": 5, "message": "oops"}), 400)
+        self.assertEqual(await self._post({"update_id": 5, "message": _MESSAGE}), 200)
+        self.assertEqual(self.webhook.stats["duplicates"], 0)
+        self.assertEqual(self.app.update_queue.qsize(), 1)
+
+    async def test_retried_update_is_queued_once(self):
+        for _ in range(2): self.assertEqual(await self._post({"update_id": 6, "message": _MESSAGE}), 200)
+        self.assertEqual(self.app.update_queue.qsize(), 1)
+        self.assertEqual(self.webhook.stats["duplicates"], 1)
+
+    async def test_wrong_or_missing_secret_is_forbidden(self):
+        for secret in (None, "", "guess"):
+            self.assertEqual(await self._post({"update_id": 7, "message": _MESSAGE}, secret), 403, secret)
+        self.assertTrue(self.app.update_queue.empty())
+        self.assertEqual(self.webhook.stats["rejected"], 3)
+
+class StartIngressSecretTest(unittest.IsolatedAsyncioTestCase):
+    """Webhook ingress never runs without a secret."""
+
+    def setUp(self):
+        self.server = WebhookServer()
+        self.server.register = mock.AsyncMock()
+        for name, value in (("INGRESS_MODE", "webhook"), ("webhook_server", self.server)):
+            patcher = mock.patch.object(webhook, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.app = SimpleNamespace(bot=SimpleNamespace(set_webhook=mock.AsyncMock()))
+
+    async def test_refuses_without_secret_or_url(self):
+        self.server.secret = ""
+        with mock.patch.object(webhook, "WEBHOOK_URL", ""), self.assertRaises(RuntimeError):
+            await start_ingress(self.app, "group")
+        self.server.register.assert_not_called()
+
+    async def test_registers_a_random_secret_with_telegram(self):
+        self.server.secret = ""
+        with mock.patch.object(webhook, "WEBHOOK_URL", "https://bot.example"):
+            await start_ingress(self.app, "group")
+        self.assertTrue(self.server.secret)
+        self.assertEqual(self.app.bot.set_webhook.call_args.kwargs["secret_token"], self.server.secret)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import time
+import asyncio
+from datetime import timedelta
+from sqlalchemy import text
+
+from core.logger import setup_logger
+from core.config import AI_BAN_REFRESH_SECONDS, AI_BAN_FULL_RELOAD_SECONDS
+from utils.time_util import utc_now
+
+logger = setup_logger("AI_BANS")
+
+_FULL = text("SELECT DISTINCT user_id FROM zenith_group_strikes WHERE strike_count >= 3")
+_SINCE = text("SELECT DISTINCT user_id FROM zenith_group_strikes WHERE strike_count >= 3 AND last_violation > :since")
+# last_violation is stamped before the group bot commits (and by another host's clock), so re-read a little behind the watermark
+_OVERLAP = timedelta(seconds=30)
+
+class GlobalBanSet:
+    """In-memory copy of every user with 3+ strikes in any group.
+
+    Loaded in full once, then topped up every AI_BAN_REFRESH_SECONDS with rows whose
+    last_violation moved past the watermark. Unbans (strike decay, purged rows) only show
+    up in the periodic full reload. Lookups never touch the database; until the first
+    load finishes nobody is treated as banned, matching the old timeout fallback.
+    """
+    def __init__(self):
+        self._banned = frozenset()
+        self._watermark = None
+        self._last_full = 0.0
+        self._task = None
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._banned
+
+    def __len__(self) -> int:
+        return len(self._banned)
+
+    def start(self):
+        if self._task is None: self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None: return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def refresh(self):
+        from zenith_ai_bot.utils import get_db_engine
+        engine = await get_db_engine()
+        if not engine: return
+        full = self._watermark is None or time.monotonic() - self._last_full > AI_BAN_FULL_RELOAD_SECONDS
+        watermark = utc_now()  # last_violation is stamped with the group bot's naive-UTC clock
+        async with engine.connect() as conn:
+            if full:
+                rows = await conn.execute(_FULL)
+            else:
+                rows = await conn.execute(_SINCE, {"since": self._watermark - _OVERLAP})
+            user_ids = {user_id for user_id, in rows}
+
+        if full:
+            self._banned, self._last_full = frozenset(user_ids), time.monotonic()
+            logger.info(f"🚫 Loaded {len(user_ids)} globally banned users")
+        elif not user_ids <= self._banned:
+            self._banned = self._banned | user_ids
+        self._watermark = watermark
+
+    async def _run(self):
+        while True:
+            try: await self.refresh()
+            except Exception as e: logger.warning(f"⚠️ Ban list refresh failed, serving the previous copy: {repr(e)}")
+            await asyncio.sleep(AI_BAN_REFRESH_SECONDS)
+
+global_bans = GlobalBanSet()
@@ -0,0 +1,67 @@
+import os
+from importlib.util import find_spec
+import httpx
+from groq import AsyncGroq
+from core.logger import setup_logger
+
+logger = setup_logger("CLIENTS")
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]"); without it the pools speak HTTP/1.1
+_HTTP2 = find_spec("h2") is not None
+
+# Per-upstream pool and timeout settings. Idle connections are kept long enough to span
+# the gaps between user requests, so most calls skip the TCP and TLS handshakes.
+_UPSTREAMS = {
+    "groq": dict(
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120.0),
+    ),
+    "serper": dict(
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0),
+    ),
+    # Arbitrary sites (link previews, page fetches): short keep-alive, since hosts rarely repeat
+    "web": dict(
+        timeout=httpx.Timeout(15.0, connect=5.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+        follow_redirects=True,
+    ),
+}
+# Whisper uploads whole voice notes, so it gets more time than a chat completion
+_GROQ_TIMEOUTS = {"chat": httpx.Timeout(60.0, connect=5.0), "whisper": httpx.Timeout(120.0, connect=5.0, write=60.0)}
+
+class Clients:
+    """Process-wide HTTP clients for the AI bot's upstreams, one keep-alive pool per upstream.
+
+    start() builds the pools before the bot takes traffic and close() releases them on
+    shutdown; anything used before start() (scripts, tests) is built on first use. The
+    Groq SDK clients are thin wrappers made on first use, and borrow the "groq" pool
+    rather than each opening their own.
+    """
+    def __init__(self):
+        self._http = {}
+        self._groq = {}
+
+    def http(self, upstream: str) -> httpx.AsyncClient:
+        client = self._http.get(upstream)
+        if client is None or client.is_closed:
+            client = self._http[upstream] = httpx.AsyncClient(http2=_HTTP2, **_UPSTREAMS[upstream])
+            if upstream == "groq": self._groq.clear()  # they hold the pool that was just replaced
+        return client
+
+    def groq(self, purpose: str = "chat") -> AsyncGroq:
+        pool = self.http("groq")
+        client = self._groq.get(purpose)
+        if client is None:
+            client = self._groq[purpose] = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=pool, timeout=_GROQ_TIMEOUTS[purpose])
+        return client
+
+    def start(self):
+        for upstream in _UPSTREAMS: self.http(upstream)
+        logger.info(f"🌐 Upstream pools ready ({', '.join(_UPSTREAMS)}; HTTP/{'2' if _HTTP2 else '1.1'})")
+
+    async def close(self):
+        clients, self._http, self._groq = list(self._http.values()), {}, {}
+        for client in clients: await client.aclose()
+
+clients = Clients()
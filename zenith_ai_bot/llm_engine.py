@@ -1,15 +1,20 @@
 import os
+import time
 import base64
-from groq import AsyncGroq
 from zenith_ai_bot.prompts import ZENITH_SYSTEM_PROMPT
 from zenith_ai_bot.search import perform_web_search
 from zenith_ai_bot.youtube import get_youtube_transcript
+from zenith_ai_bot.clients import clients
 from core.logger import setup_logger
+from core.metrics import registry
 
 logger = setup_logger("LLM_ENGINE")
+_SEARCH = registry.histogram("zenith_ai_stage_seconds", "Time per AI request stage", stage="search")
+_LLM = registry.histogram("zenith_ai_stage_seconds", "Time per AI request stage", stage="llm")
+_FIRST_TOKEN = registry.histogram("zenith_ai_stage_seconds", "Time per AI request stage", stage="llm_first_token")
 
 async def transcribe_voice(file_path: str) -> str:
-    client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+    client = clients.groq("whisper")
     try:
         with open(file_path, "rb") as file:
             transcription = await client.audio.transcriptions.create(
@@ -24,16 +29,17 @@ async def transcribe_voice(file_path: str) -> str:
         logger.error(f"Whisper API Error: {e}")
         return "ERROR:API_FAIL"
 
-async def process_ai_query(user_text: str, image_bytes: bytes = None, context_data: str = None) -> str:
-    client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+async def process_ai_query(user_text: str, image_bytes: bytes = None, context_data: str = None):
+    """Streams the answer: yields text chunks as the model produces them."""
+    client = clients.groq()
     
     external_context = ""
     # Bug Fix: Properly checks standard YouTube URLs
     if "youtube.com/watch" in user_text or "youtu.be/" in user_text:
-        transcript = await get_youtube_transcript(user_text)
+        with _SEARCH.time(): transcript = await get_youtube_transcript(user_text)
         if transcript: external_context = f"\n\n[YOUTUBE TRANSCRIPT]\n{transcript}"
     elif any(keyword in user_text.lower() for keyword in ["today", "current", "news", "price", "latest"]):
-        search_results = await perform_web_search(user_text)
+        with _SEARCH.time(): search_results = await perform_web_search(user_text)
         if search_results: external_context = f"\n\n[LIVE WEB DATA]\n{search_results}\nCite your sources using HTML <a href>."
 
     final_context = ""
@@ -54,15 +60,24 @@ async def process_ai_query(user_text: str, image_bytes: bytes = None, context_da
             "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
         })
 
+    started, produced = time.perf_counter(), False
     try:
-        response = await client.chat.completions.create(
+        stream = await client.chat.completions.create(
             messages=[
                 {"role": "system", "content": ZENITH_SYSTEM_PROMPT},
                 {"role": "user", "content": content_payload}
             ],
-            model=model_name, temperature=0.3, max_tokens=2048
+            model=model_name, temperature=0.3, max_tokens=2048, stream=True
         )
-        return response.choices[0].message.content
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta: continue
+            if not produced: _FIRST_TOKEN.observe(time.perf_counter() - started)
+            produced = True
+            yield delta
     except Exception as e:
         logger.error(f"Groq API Error: {e}")
-        return "📡 Connection to AI servers lost. Please try again."
\ No newline at end of file
+        # Keep what already reached the user; just say it stopped short
+        yield "\n\n<i>[Response interrupted]</i>" if produced else "📡 Connection to AI servers lost. Please try again."
+    finally:
+        _LLM.observe(time.perf_counter() - started)
\ No newline at end of file
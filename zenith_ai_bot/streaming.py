@@ -0,0 +1,124 @@
+import re
+import time
+import asyncio
+from datetime import timedelta
+from telegram.error import BadRequest, RetryAfter
+
+from zenith_ai_bot.utils import sanitize_telegram_html, sanitize_partial_html
+from core.config import AI_STREAM_EDIT_SECONDS
+from core.logger import setup_logger
+from core.metrics import registry
+
+logger = setup_logger("STREAMING")
+
+_LIMIT = 4000
+_GROUP_EDIT_SECONDS = 3.0  # edits count against a group's ~20 messages/minute
+_FIRST_TEXT = registry.histogram("zenith_ai_first_text_seconds", "Time from queueing an AI request to the first answer text shown")
+_EDIT = registry.histogram("zenith_ai_stage_seconds", "Time per AI request stage", stage="edit")
+_edits = registry.counter("zenith_ai_stream_edits_total", "Progressive edits sent while an answer streams")
+
+class StreamedReply:
+    """Shows an answer in the placeholder message while it is still being generated.
+
+    Chunks are only appended to a buffer; a separate loop edits the placeholder with the
+    latest sanitized prefix at most once per interval, so a slow edit never holds up the
+    stream and a 429 only delays the next edit. The last edit is the complete answer, with
+    the usual HTML-to-plain-text fallback.
+    """
+    def __init__(self, bot, placeholder, queued_at: float, private: bool = True):
+        self.bot, self.placeholder, self.queued_at = bot, placeholder, queued_at
+        self.interval = AI_STREAM_EDIT_SECONDS if private else max(AI_STREAM_EDIT_SECONDS, _GROUP_EDIT_SECONDS)
+        self.raw = ""
+        self._shown = None
+        self._plain = False          # a partial failed to parse as HTML; later partials go out as plain text
+        self._blocked_until = 0.0    # monotonic deadline from Telegram's last 429
+        self._closed = asyncio.Event()
+
+    async def run(self, chunks):
+        """Consumes the async iterator of text chunks and leaves the full answer in the placeholder."""
+        editor = None
+        try:
+            async for chunk in chunks:
+                self.raw += chunk
+                if editor is None and self.interval > 0: editor = asyncio.create_task(self._edit_loop())
+        finally:
+            self._closed.set()
+            # Let an in-flight edit finish, so it can't land after the final one
+            if editor is not None: await asyncio.gather(editor, return_exceptions=True)
+        await self._finish()
+
+    async def _edit_loop(self):
+        while not self._closed.is_set():
+            wait = self._blocked_until - time.monotonic()
+            if wait <= 0:
+                text = sanitize_partial_html(self.raw)
+                if len(text) > _LIMIT: return  # too long to preview; the final edit truncates properly
+                if text and text != self._shown: await self._edit(text)
+                wait = self.interval
+            try: await asyncio.wait_for(self._closed.wait(), wait)
+            except asyncio.TimeoutError: pass
+
+    async def _edit(self, text: str):
+        try:
+            if not self._plain:
+                try: await self._send(text, html=True)
+                except BadRequest as e:
+                    if "not modified" in str(e).lower(): return
+                    self._plain = True
+            if self._plain: await self._send(_strip_tags(text), html=False)
+        except RetryAfter as e:
+            self._blocked_until = time.monotonic() + _seconds(e.retry_after)
+            return
+        except Exception as e:
+            logger.debug(f"Progressive edit skipped: {e}")
+            return
+        self._shown = text
+        _edits.inc()
+        self._seen()
+
+    async def _finish(self):
+        text = sanitize_telegram_html(self.raw)
+        # Safe Truncation
+        if len(text) > _LIMIT:
+            text = text[:_LIMIT] + "\n\n<i>[Truncated due to Telegram limits]</i>"
+        if text == self._shown and not self._plain: return
+        try:
+            with _EDIT.time(): await self._send_final(text, html=True)
+        except Exception as html_err:
+            logger.warning(f"HTML Parse Error, engaging fallback: {html_err}")
+            # Fallback to plain text if HTML crashes
+            await self._send_final(_strip_tags(text), html=False)
+        self._seen()
+
+    async def _send_final(self, text: str, html: bool, attempts: int = 3):
+        """The answer itself must land, so a 429 here is waited out rather than skipped."""
+        for attempt in range(attempts):
+            wait = self._blocked_until - time.monotonic()
+            if wait > 0: await asyncio.sleep(wait)
+            try: return await self._send(text, html)
+            except RetryAfter as e:
+                if attempt == attempts - 1: raise
+                self._blocked_until = time.monotonic() + _seconds(e.retry_after)
+            except BadRequest as e:
+                if "not modified" in str(e).lower(): return
+                raise
+
+    async def _send(self, text: str, html: bool):
+        await self.bot.edit_message_text(
+            chat_id=self.placeholder.chat_id,
+            message_id=self.placeholder.message_id,
+            text=text,
+            parse_mode="HTML" if html else None,
+            disable_web_page_preview=True
+        )
+
+    def _seen(self):
+        if self.queued_at is not None:
+            _FIRST_TEXT.observe(time.perf_counter() - self.queued_at)
+            self.queued_at = None
+
+def _strip_tags(text: str) -> str:
+    return re.sub(r"<[^>]+>", "", text)
+
+def _seconds(retry_after) -> float:
+    return retry_after.total_seconds() if isinstance(retry_after, timedelta) else float(retry_after)
@@ -1,13 +1,15 @@
 import re
-import asyncio
 from cachetools import TTLCache
 import fitz  
 from pydub import AudioSegment
 from core.logger import setup_logger
+from core.metrics import registry
+from zenith_ai_bot.bans import global_bans
 
 logger = setup_logger("AI_UTILS")
 
 ai_rate_limit = TTLCache(maxsize=10000, ttl=60.0)
+rate_limited = registry.counter("zenith_ai_rate_limited_total", "AI requests refused by the per-user limit of 5 a minute")
 _ai_db_engine = None
 
 async def get_db_engine():
@@ -24,33 +26,18 @@ async def dispose_db_engine():
     if _ai_db_engine:
         await _ai_db_engine.dispose()
 
-async def check_user_ban_status(user_id: int) -> bool:
-    try:
-        engine = await get_db_engine()
-        if not engine: return False
-        from sqlalchemy import text
-        
-        async def fetch_db():
-            async with engine.connect() as conn:
-                query = text("SELECT strike_count FROM zenith_group_strikes WHERE user_id = :uid AND strike_count >= 3 LIMIT 1")
-                result = await conn.execute(query, {"uid": user_id})
-                return result.scalar() is not None
-        
-        return await asyncio.wait_for(fetch_db(), timeout=5.0)
-    except asyncio.TimeoutError:
-        logger.warning("⚠️ DB Fallback: Connection Timeout (Database took too long to respond).")
-        return False
-    except Exception as e:
-        logger.warning(f"⚠️ DB Fallback Triggered: {repr(e)}")
-        return False
+def check_user_ban_status(user_id: int) -> bool:
+    """Memory-only; global_bans is kept current in the background."""
+    return user_id in global_bans
 
 async def check_ai_rate_limit(user_id: int) -> tuple[bool, str]:
-    is_banned = await check_user_ban_status(user_id)
+    is_banned = check_user_ban_status(user_id)
     if is_banned:
         return False, "🚫 You are globally banned from Zenith services due to group violations."
 
     current_requests = ai_rate_limit.get(user_id, 0)
     if current_requests >= 5:
+        rate_limited.inc()
         return False, "⏳ You are requesting too fast! Zenith AI needs a moment to rest. Please wait 60 seconds."
     
     ai_rate_limit[user_id] = current_requests + 1
@@ -78,6 +65,23 @@ def sanitize_telegram_html(text: str) -> str:
     
     return text.strip()
 
+_TAG = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)[^>]*>")
+_CUT_OFF = re.compile(r"(<(/?([a-zA-Z][^<>]*)?)?|&#?[a-zA-Z0-9]*)$")
+
+def sanitize_partial_html(text: str) -> str:
+    """sanitize_telegram_html for a response still being generated: a tag or entity cut off
+    at the end is held back and tags left open are closed, so every prefix parses."""
+    text = _CUT_OFF.sub("", sanitize_telegram_html(text))
+
+    open_tags = []
+    for match in _TAG.finditer(text):
+        closing, name = match.group(1), match.group(2).lower()
+        if not closing: open_tags.append(name)
+        elif name in open_tags:
+            # Telegram rejects overlaps anyway; dropping to the matching opener keeps the stack honest
+            del open_tags[len(open_tags) - 1 - open_tags[::-1].index(name):]
+    return text + "".join(f"</{name}>" for name in reversed(open_tags))
+
 def is_file_allowed(file_size: int) -> bool:
     if not file_size: return False
     return file_size <= (20 * 1024 * 1024)
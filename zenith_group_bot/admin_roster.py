@@ -0,0 +1,98 @@
+import time
+import asyncio
+import logging
+from cachetools import LRUCache
+from telegram import ChatMember, ChatMemberUpdated
+
+from core.config import ADMIN_ROSTER_SIZE, ADMIN_ROSTER_TTL
+from core.metrics import registry
+
+logger = logging.getLogger("ADMIN_ROSTER")
+
+_ADMIN_STATUSES = frozenset((ChatMember.ADMINISTRATOR, ChatMember.OWNER))
+_RETRY_SECONDS = 60  # is_admin treats a chat whose roster couldn't be fetched as having no admins this long
+_loads = registry.counter("zenith_admin_roster_loads_total", "get_chat_administrators calls made to fill the roster")
+
+class AdminRoster:
+    """Each chat's administrators, held in memory.
+
+    A chat is loaded with one get_chat_administrators call and then kept current from
+    chat_member and my_chat_member updates instead of being fetched again. Telegram only
+    sends chat_member updates while we are an admin ourselves, so the TTL is a backstop
+    for whatever changed while we weren't. Concurrent loads of one chat share the call.
+    """
+    def __init__(self, maxsize: int = ADMIN_ROSTER_SIZE, ttl: float = ADMIN_ROSTER_TTL):
+        self.ttl = ttl
+        self._rosters = LRUCache(maxsize=maxsize)  # chat_id -> (monotonic expiry, {user_id: ChatMember})
+        self._loading = {}                         # chat_id -> task running get_chat_administrators
+        self._failed = LRUCache(maxsize=maxsize)   # chat_id -> monotonic time is_admin may try loading again
+
+    def __len__(self) -> int:
+        return len(self._rosters)
+
+    def peek(self, chat_id: int) -> dict | None:
+        entry = self._rosters.get(chat_id)
+        if entry is None or entry[0] < time.monotonic(): return None
+        return entry[1]
+
+    def is_admin(self, bot, chat_id: int, user_id: int) -> bool:
+        """Hot-path check that never waits: until a chat's roster has loaded (in the background), nobody is exempt."""
+        admins = self.peek(chat_id)
+        if admins is None:
+            if self._failed.get(chat_id, 0.0) <= time.monotonic(): self._load(bot, chat_id)
+            return False
+        return user_id in admins
+
+    async def get(self, bot, chat_id: int) -> dict:
+        """user_id -> ChatMember for the chat's admins (the bot included, with its rights, if it is one).
+
+        Always loads a missing roster, even one that just failed, and raises if that fails.
+        """
+        admins = self.peek(chat_id)
+        if admins is not None: return admins
+        return await asyncio.shield(self._load(bot, chat_id))
+
+    def apply(self, change: ChatMemberUpdated, own_id: int):
+        """Folds a chat_member or my_chat_member update into the chat's roster."""
+        chat_id, member = change.chat.id, change.new_chat_member
+        was_admin = change.old_chat_member.status in _ADMIN_STATUSES
+        if member.user.id == own_id and not was_admin:
+            # Promoted (or re-added): changes made while we weren't an admin never reached us
+            return self.forget(chat_id)
+        admins = self.peek(chat_id)
+        if admins is None: return
+        if member.status in _ADMIN_STATUSES: admins[member.user.id] = member
+        else: admins.pop(member.user.id, None)
+
+    def forget(self, chat_id: int):
+        self._rosters.pop(chat_id, None)
+        self._failed.pop(chat_id, None)
+
+    def _load(self, bot, chat_id: int) -> asyncio.Task:
+        task = self._loading.get(chat_id)
+        if task is None:
+            task = self._loading[chat_id] = asyncio.create_task(self._fetch(bot, chat_id))
+            task.add_done_callback(_consume_exception)
+        return task
+
+    async def _fetch(self, bot, chat_id: int) -> dict:
+        _loads.inc()
+        try:
+            members = await bot.get_chat_administrators(chat_id)
+        except Exception as e:
+            logger.debug(f"Could not load admins of {chat_id}: {e}")
+            self._failed[chat_id] = time.monotonic() + _RETRY_SECONDS
+            raise
+        finally:
+            self._loading.pop(chat_id, None)
+        admins = {m.user.id: m for m in members}
+        self._failed.pop(chat_id, None)
+        self._rosters[chat_id] = (time.monotonic() + self.ttl, admins)
+        return admins
+
+def _consume_exception(task: asyncio.Task):
+    # Background loads have no one awaiting them; the failure is already logged
+    if not task.cancelled(): task.exception()
+
+admin_roster = AdminRoster()
+registry.gauge("zenith_admin_roster_chats", "Chats with an administrator roster in memory", fn=lambda: len(admin_roster))
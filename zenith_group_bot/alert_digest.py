@@ -0,0 +1,104 @@
+import html
+import asyncio
+import logging
+from collections import Counter
+from telegram.error import Forbidden
+
+from zenith_group_bot.outbound import outbound, WARNING, OWNER_DM
+from core.config import ALERT_DIGEST_INTERVAL, ALERT_DIGEST_MAX_EVENTS
+
+logger = logging.getLogger("ALERT_DIGEST")
+
+_SHOWN_USERS = 3
+_MESSAGE_LIMIT = 4000  # Telegram rejects messages over 4096 characters
+
+class _Entry:
+    __slots__ = ("group_name", "count", "actions", "users")
+
+    def __init__(self, group_name: str):
+        self.group_name, self.count = group_name, 0
+        self.actions, self.users = Counter(), []
+
+class AlertDigest:
+    """Per-owner buffer of moderation events, flushed as one compact DM.
+
+    Events are grouped by (chat, reason). An owner's buffer goes out `interval` seconds
+    after its first event, or as soon as it holds `max_events`, whichever comes first.
+    """
+    def __init__(self, interval: float = ALERT_DIGEST_INTERVAL, max_events: int = ALERT_DIGEST_MAX_EVENTS):
+        self.interval, self.max_events = interval, max_events
+        self._buffers = {}   # owner_id -> {(chat_id, reason): _Entry}
+        self._sizes = {}     # owner_id -> buffered event count
+        self._timers = {}    # owner_id -> TimerHandle
+        self._bot = None
+        self._flushing = set()
+        self.stats = {"events": 0, "digests": 0}
+
+    def add(self, bot, chat_id: int, owner_id: int, group_name: str, username: str, reason: str, action: str):
+        self._bot = bot
+        self.stats["events"] += 1
+        buffer = self._buffers.setdefault(owner_id, {})
+        entry = buffer.get((chat_id, reason))
+        if entry is None: entry = buffer[(chat_id, reason)] = _Entry(group_name)
+        entry.count += 1
+        entry.actions[action] += 1
+        if username not in entry.users: entry.users.append(username)
+
+        self._sizes[owner_id] = self._sizes.get(owner_id, 0) + 1
+        if self._sizes[owner_id] >= self.max_events:
+            self._spawn_flush(owner_id)
+        elif owner_id not in self._timers:
+            self._timers[owner_id] = asyncio.get_running_loop().call_later(self.interval, self._spawn_flush, owner_id)
+
+    def _spawn_flush(self, owner_id: int):
+        task = asyncio.create_task(self.flush(owner_id))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def flush(self, owner_id: int):
+        timer = self._timers.pop(owner_id, None)
+        if timer: timer.cancel()
+        buffer = self._buffers.pop(owner_id, None)
+        total = self._sizes.pop(owner_id, 0)
+        if not buffer: return
+
+        bot = self._bot
+        self.stats["digests"] += 1
+        try:
+            for text in render_digest(buffer, total):
+                await outbound.submit(OWNER_DM, owner_id, lambda t=text: bot.send_message(chat_id=owner_id, text=t, parse_mode="HTML"))
+        except Forbidden:
+            # Scenario 4: The Silent Treatment (Owner blocked the bot). One public tag per affected group.
+            for chat_id in {chat_id for chat_id, _ in buffer}:
+                fallback_text = f"🚨 <a href='tg://user?id={owner_id}'>Admin</a>, I caught rule violations here but couldn't DM you because you blocked me! Please unblock me."
+                outbound.submit(WARNING, chat_id, lambda c=chat_id, t=fallback_text: bot.send_message(chat_id=c, text=t, parse_mode="HTML"), ("blocked", chat_id))
+        except Exception as e:
+            logger.warning(f"Could not deliver digest to owner {owner_id}: {e}")
+
+    async def flush_all(self):
+        """Sends whatever is buffered; called on shutdown before the outbound scheduler stops."""
+        await asyncio.gather(*(self.flush(owner_id) for owner_id in list(self._buffers)), *self._flushing, return_exceptions=True)
+
+def render_digest(buffer: dict, total: int) -> list[str]:
+    """The digest as one or more messages under Telegram's limit, split between lines; a group
+    carried over to the next message repeats its header."""
+    messages, text = [], f"🚨 <b>Zenith Security Digest</b> ({total} event{'s' if total != 1 else ''})"
+    current_chat = None
+    for (chat_id, reason), entry in sorted(buffer.items(), key=lambda item: (item[1].group_name, item[0][0], -item[1].count)):
+        header = f"\n<b>Group:</b> {html.escape(entry.group_name or str(chat_id))}"
+        users = ", ".join(f"@{u}" for u in entry.users[:_SHOWN_USERS])
+        if len(entry.users) > _SHOWN_USERS: users += f" +{len(entry.users) - _SHOWN_USERS} more"
+        actions = ", ".join(f"{action} ×{n}" if n > 1 else action for action, n in entry.actions.most_common(2))
+        if len(entry.actions) > 2: actions += ", …"
+        line = f"• <b>{html.escape(reason)}</b> ×{entry.count}: {actions}\n   {users}"
+
+        block = f"{header}\n{line}" if chat_id != current_chat else line
+        if len(text) + len(block) + 1 > _MESSAGE_LIMIT:
+            messages.append(text)
+            text, block = "", f"{header.lstrip()}\n{line}"
+        current_chat = chat_id
+        text = f"{text}\n{block}" if text else block
+    messages.append(text)
+    return messages
+
+alert_digest = AlertDigest()
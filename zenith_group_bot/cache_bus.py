@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from uuid import uuid4
+import asyncpg
+from sqlalchemy import text
+
+logger = logging.getLogger("CACHE_BUS")
+
+CHANNEL = "zenith_cache"
+# Tags our own notifications so a replica doesn't drop the cache entry it just wrote
+ORIGIN = uuid4().hex[:12]
+
+class CacheBus:
+    """In-process invalidation bus. Stand-in for single-replica runs and tests.
+
+    Payloads are "<kind>:<chat_id>"; handlers receive the chat_id, or None when
+    every entry must be dropped (e.g. the listener reconnected and may have missed events).
+    """
+    def __init__(self):
+        self._handlers = {}
+        self.connected = asyncio.Event()  # set while invalidations are being received
+
+    def subscribe(self, kind: str, handler):
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def deliver(self, kind: str, chat_id: int | None):
+        for handler in self._handlers.get(kind, ()):
+            try: handler(chat_id)
+            except Exception as e: logger.error(f"Invalidation handler for {kind} failed: {e}")
+
+    def deliver_all(self):
+        for kind in self._handlers: self.deliver(kind, None)
+
+    async def publish(self, session, kind: str, chat_id: int):
+        """No peers to tell: the writing process updates its own caches. Tests call deliver() to play a peer."""
+
+    async def listen(self):
+        self.connected.set()
+        await asyncio.Event().wait()
+
+class PostgresCacheBus(CacheBus):
+    """NOTIFY inside the writer's transaction, LISTEN on a dedicated connection in every replica."""
+    def __init__(self, dsn: str):
+        super().__init__()
+        self.dsn = dsn
+
+    async def publish(self, session, kind: str, chat_id: int):
+        # Queued by Postgres and only delivered if the surrounding transaction commits
+        await session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": f"{kind}:{chat_id}:{ORIGIN}"})
+
+    def _on_notify(self, connection, pid, channel, payload):
+        kind, chat_id, origin = payload.split(":")
+        if origin != ORIGIN: self.deliver(kind, int(chat_id))
+
+    async def listen(self):
+        retry_delay = 1
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _: lost.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                # Anything published while we were disconnected is gone; start clean
+                self.deliver_all()
+                self.connected.set()
+                retry_delay = 1
+                logger.info("Listening for cache invalidations")
+                await lost.wait()
+                logger.warning("Cache invalidation listener lost its connection")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed: {e}. Retrying in {retry_delay}s")
+            finally:
+                self.connected.clear()
+                if conn and not conn.is_closed(): await conn.close()
+            self.deliver_all()
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30)
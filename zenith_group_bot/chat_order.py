@@ -0,0 +1,40 @@
+import logging
+from collections import deque
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger("CHAT_ORDER")
+
+class ChatOrderedProcessor(BaseUpdateProcessor):
+    """Runs different chats' updates side by side but each chat's one at a time, in arrival order.
+
+    The first update of a chat drains that chat: later ones that reach do_process_update
+    while it runs are queued behind it and return at once, so a burst in one chat holds a
+    single concurrency slot instead of filling the slots other chats need. Updates reach
+    do_process_update in the order they took a slot, which is the order they arrived.
+    """
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self._chats = {}  # chat_id -> deque of coroutines waiting behind the one running
+
+    async def do_process_update(self, update, coroutine):
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None: return await coroutine
+        waiting = self._chats.get(chat.id)
+        if waiting is not None: return waiting.append(coroutine)
+        waiting = self._chats[chat.id] = deque()
+        try:
+            await coroutine
+            while waiting:
+                try: await waiting.popleft()
+                except Exception as e: logger.error(f"Update in chat {chat.id} failed: {e}")
+        finally:
+            del self._chats[chat.id]
+            # Only reached with updates still queued if the drain itself was cancelled
+            for pending in waiting: pending.close()
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
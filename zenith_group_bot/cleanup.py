@@ -0,0 +1,105 @@
+import time
+import heapq
+import asyncio
+import logging
+from telegram.constants import BulkRequestLimit
+
+from zenith_group_bot.outbound import outbound, CLEANUP
+from zenith_group_bot.repository import CleanupRepo
+from zenith_group_bot.sharding import owns
+
+logger = logging.getLogger("CLEANUP")
+
+class DeletionScheduler:
+    """One task that removes the bot's ephemeral notices when they expire.
+
+    Pending deletions sit in a heap keyed by due time. Everything due at the same tick is
+    grouped per chat into delete_messages calls of up to 100 ids. New entries are written
+    to Postgres in batches every `persist_interval` seconds, so a restart (crash included)
+    reloads them; at most that interval's worth of fresh alerts can be lost.
+    """
+    def __init__(self, persist_interval: float = 1.0):
+        self.persist_interval = persist_interval
+        self._heap = []       # (due epoch, chat_id, message_id)
+        self._unsaved = []    # entries not yet in Postgres
+        self._done = []       # (chat_id, message_id) to drop from Postgres
+        self._wake = asyncio.Event()
+        self._task = None
+        self._inflight = set()
+        self._bot = None
+        self.stats = {"scheduled": 0, "deleted": 0, "calls": 0}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    async def start(self, bot):
+        """Replaces the in-memory schedule with the persisted one and starts the loop."""
+        if self._task: return
+        self._bot = bot
+        try:
+            self._heap = [entry for entry in await CleanupRepo.load() if owns(entry[1])]
+            heapq.heapify(self._heap)
+            if self._heap: logger.info(f"🧹 Restored {len(self._heap)} pending alert deletions")
+        except Exception as e:
+            logger.error(f"Could not restore pending deletions: {e}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if not self._task: return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self._persist()
+
+    def schedule(self, chat_id: int, message_id: int, delay: float):
+        due = time.time() + delay
+        entry = (due, chat_id, message_id)
+        heapq.heappush(self._heap, entry)
+        self._unsaved.append(entry)
+        self.stats["scheduled"] += 1
+        if self._heap[0] is entry: self._wake.set()
+
+    async def _run(self):
+        while True:
+            await self._persist()
+            now = time.time()
+            due = {}
+            while self._heap and self._heap[0][0] <= now:
+                _, chat_id, message_id = heapq.heappop(self._heap)
+                due.setdefault(chat_id, []).append(message_id)
+            for chat_id, message_ids in due.items():
+                for i in range(0, len(message_ids), BulkRequestLimit.MAX_LIMIT):
+                    task = asyncio.create_task(self._delete(chat_id, message_ids[i:i + BulkRequestLimit.MAX_LIMIT]))
+                    self._inflight.add(task)
+                    task.add_done_callback(self._inflight.discard)
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            if self._unsaved or self._done:
+                timeout = self.persist_interval if timeout is None else min(timeout, self.persist_interval)
+            self._wake.clear()
+            try: await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError: pass
+
+    async def _delete(self, chat_id: int, message_ids: list[int]):
+        bot = self._bot
+        self.stats["calls"] += 1
+        try:
+            await outbound.submit(CLEANUP, chat_id, lambda: bot.delete_messages(chat_id, message_ids))
+            self.stats["deleted"] += len(message_ids)
+        except Exception as e:
+            # Already gone or we lost rights; either way retrying won't help
+            logger.debug(f"Bulk delete of {len(message_ids)} messages in {chat_id} failed: {e}")
+        self._done.extend((chat_id, message_id) for message_id in message_ids)
+        if not self._heap: self._wake.set()  # nothing else will wake the loop to record this
+
+    async def _persist(self):
+        unsaved, self._unsaved = self._unsaved, []
+        done, self._done = self._done, []
+        try:
+            await CleanupRepo.save(unsaved)
+            await CleanupRepo.forget(done)
+        except Exception as e:
+            logger.error(f"Could not persist pending deletions: {e}")
+            self._unsaved[:0], self._done[:0] = unsaved, done
+
+deletion_scheduler = DeletionScheduler()
@@ -0,0 +1,145 @@
+import time
+from collections import OrderedDict
+from cachetools import LRUCache
+
+from zenith_group_bot.filters import tokenize
+from utils.hash_util import generate_hash
+
+# (distinct users, seconds): this many accounts posting the same content inside the window is a copy-paste raid
+DUPLICATE_LIMITS = {
+    "low": (6, 60.0),
+    "medium": (4, 60.0),
+    "strict": (3, 60.0),
+}
+# Plain text repeats innocently ("happy birthday dear sir" from half the class), so only long
+# copies count on their own. Text carrying a link or mention needs _MIN_TOKENS; links always count.
+_MIN_TOKENS = 4
+_MIN_PLAIN_TOKENS = 12
+# SimHash bits that may differ for two texts to count as the same content. Chat messages are
+# short, so a swapped word or two moves 5-12 bits; unrelated texts sit 15+ apart.
+_MAX_DISTANCE = 12
+# Candidates are found through 8 bands of 8 bits. A variant within _MAX_DISTANCE shares one
+# ~80% of the time; narrower bands find more but collide with most of a chat's clusters.
+# Exact copies are always found through their hash.
+_BANDS = 8
+_BAND_BITS = 64 // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+_MASK = (1 << 64) - 1
+_CLUSTERS_PER_CHAT = 256
+_SENDERS_PER_CLUSTER = 32
+
+def simhash(tokens) -> int:
+    """64-bit SimHash of a set of tokens, each weighted 1.
+
+    Per-bit vote counts are kept bit-sliced (counters[j] holds bit j of all 64 counts),
+    so each token costs a few integer operations rather than 64 separate additions.
+    """
+    counters = []
+    for token in tokens:
+        carry = hash(token) & _MASK
+        for j in range(len(counters)):
+            counters[j], carry = counters[j] ^ carry, counters[j] & carry
+            if not carry: break
+        if carry: counters.append(carry)
+
+    # Set the bits whose count is a strict majority, comparing all 64 counters at once
+    threshold, above, equal = len(tokens) // 2, 0, _MASK
+    for j in range(len(counters) - 1, -1, -1):
+        if threshold >> j & 1: equal &= counters[j]
+        else:
+            above |= equal & counters[j]
+            equal &= ~counters[j]
+    return above
+
+class _Cluster:
+    __slots__ = ("fingerprint", "exact", "senders", "flagged_until")
+
+    def __init__(self, fingerprint: int, exact: str):
+        self.fingerprint, self.exact = fingerprint, exact
+        self.senders = OrderedDict()  # user_id -> (monotonic, message_id), oldest first
+        self.flagged_until = 0.0
+
+class _ChatIndex:
+    """One chat's recent content: an LRU of clusters reachable by exact hash or by any SimHash band."""
+    __slots__ = ("clusters", "exact", "bands")
+
+    def __init__(self):
+        self.clusters = OrderedDict()  # id(cluster) -> cluster, least recently seen first
+        self.exact = {}                # exact hash -> cluster
+        self.bands = {}                # (band, value) -> cluster
+
+    def find(self, fingerprint: int) -> _Cluster | None:
+        for band in range(_BANDS):
+            cluster = self.bands.get((band, fingerprint >> band * _BAND_BITS & _BAND_MASK))
+            if cluster is not None and (cluster.fingerprint ^ fingerprint).bit_count() <= _MAX_DISTANCE:
+                return cluster
+        return None
+
+    def add(self, fingerprint: int, exact: str) -> _Cluster:
+        if len(self.clusters) >= _CLUSTERS_PER_CHAT: self._evict()
+        cluster = _Cluster(fingerprint, exact)
+        self.clusters[id(cluster)] = cluster
+        self.exact[exact] = cluster
+        for band in range(_BANDS): self.bands[(band, fingerprint >> band * _BAND_BITS & _BAND_MASK)] = cluster
+        return cluster
+
+    def _evict(self):
+        _, cluster = self.clusters.popitem(last=False)
+        if self.exact.get(cluster.exact) is cluster: del self.exact[cluster.exact]
+        for band in range(_BANDS):
+            key = (band, cluster.fingerprint >> band * _BAND_BITS & _BAND_MASK)
+            if self.bands.get(key) is cluster: del self.bands[key]
+
+class DuplicateGuard:
+    """Cross-user copy-paste detector, all in memory.
+
+    Messages are folded the same way as the abuse filter, then fingerprinted twice: a
+    SHA-256 of the folded text for exact copies and a SimHash for copies with a few words
+    changed. A lookup is one dict probe plus at most _BANDS more, and memory is capped at
+    _CLUSTERS_PER_CHAT clusters of _SENDERS_PER_CLUSTER senders per chat.
+    """
+    __slots__ = ("_chats",)
+
+    def __init__(self, max_chats: int = 10000):
+        self._chats = LRUCache(maxsize=max_chats)
+
+    def check(self, chat_id: int, user_id: int, message_id: int, text: str, limits: tuple, links: tuple = (), promo: bool = False, now: float = None) -> tuple[bool, list[int]]:
+        """Records one message. Returns (is_copy_paste_raid, earlier message_ids of the same burst to remove).
+
+        `links` are hidden link targets, folded into the content; `promo` says the text shows
+        a link or mention, which lets shorter copies count.
+        """
+        _, tokens = tokenize(text)
+        if len(tokens) < (_MIN_TOKENS if promo else _MIN_PLAIN_TOKENS) and not links: return False, []
+        tokens += links
+        now = time.monotonic() if now is None else now
+        limit, window = limits
+
+        index = self._chats.get(chat_id)
+        if index is None: index = self._chats[chat_id] = _ChatIndex()
+        # Verbatim copies are settled by the hash alone; only new text pays for a SimHash
+        exact = generate_hash(" ".join(tokens))
+        cluster = index.exact.get(exact)
+        if cluster is None:
+            # Distinct words only: "hello hello hello" shouldn't pull unrelated chatter together
+            fingerprint = simhash(set(tokens))
+            cluster = index.find(fingerprint) or index.add(fingerprint, exact)
+        index.clusters.move_to_end(id(cluster))
+
+        senders = cluster.senders
+        senders.pop(user_id, None)
+        senders[user_id] = (now, message_id)
+        while senders and (len(senders) > _SENDERS_PER_CLUSTER or next(iter(senders.values()))[0] < now - window):
+            senders.popitem(last=False)
+
+        if now < cluster.flagged_until:
+            cluster.flagged_until = now + window
+            return True, []
+        if len(senders) < limit: return False, []
+        # The burst is confirmed: this copy is the violation, the earlier ones just go
+        cluster.flagged_until = now + window
+        earlier = [mid for uid, (_, mid) in senders.items() if uid != user_id]
+        senders.clear()
+        return True, earlier
+
+duplicate_guard = DuplicateGuard()
@@ -0,0 +1,72 @@
+import time
+import asyncio
+import logging
+from collections import deque
+
+from zenith_group_bot.repository import EventRepo
+from core.config import EVENT_LOG_CAPACITY, EVENT_LOG_FLUSH_SECONDS
+from core.metrics import registry
+from utils.time_util import utc_now
+
+logger = logging.getLogger("EVENT_LOG")
+
+_written = registry.counter("zenith_event_log_records_total", "Moderation event records by outcome", outcome="written")
+_dropped = registry.counter("zenith_event_log_records_total", "Moderation event records by outcome", outcome="dropped")
+
+class EventLog:
+    """Append-only record of every enforcement action, written off the hot path.
+
+    record() only appends a tuple to a bounded ring; when the ring is full the oldest
+    record is dropped, so logging can never hold up enforcement or grow without bound.
+    A background task drains the ring every `flush_interval` seconds (sooner once a
+    batch is waiting) with one COPY per `batch` records. A failed COPY puts its records
+    back if there is room, and the next flush retries them.
+    """
+    def __init__(self, capacity: int = EVENT_LOG_CAPACITY, flush_interval: float = EVENT_LOG_FLUSH_SECONDS, batch: int = 5000):
+        self.flush_interval, self.batch = flush_interval, batch
+        self._ring = deque(maxlen=capacity)
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def record(self, chat_id: int, user_id: int, message_id: int, action: str, reason: str = None, started: float = None):
+        """`started` is the handler's time.perf_counter() at entry; latency is measured up to this call."""
+        if len(self._ring) == self._ring.maxlen: _dropped.inc()
+        latency_ms = (time.perf_counter() - started) * 1000 if started is not None else None
+        self._ring.append((utc_now(), chat_id, user_id, message_id, action, reason, latency_ms))
+        if len(self._ring) >= self.batch: self._wake.set()
+
+    def start(self):
+        if self._task is None: self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None: return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try: await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError: pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        while self._ring:
+            batch = [self._ring.popleft() for _ in range(min(self.batch, len(self._ring)))]
+            try:
+                await EventRepo.copy_events(batch)
+            except Exception as e:
+                logger.warning(f"⚠️ Event log COPY failed, keeping what fits for the next flush: {e}")
+                keep = batch[len(batch) - min(len(batch), self._ring.maxlen - len(self._ring)):]
+                self._ring.extendleft(reversed(keep))
+                _dropped.inc(len(batch) - len(keep))
+                return
+            _written.inc(len(batch))
+
+event_log = EventLog()
+registry.gauge("zenith_event_log_pending", "Moderation event records waiting for the next COPY", fn=lambda: len(event_log))
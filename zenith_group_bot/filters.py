@@ -1,15 +1,174 @@
 import re
+import unicodedata
+from functools import lru_cache
+from itertools import groupby
 from zenith_group_bot.word_list import BANNED_WORDS
 
-# Compile regex at startup (O(1) time complexity) instead of per message
-_PATTERN_STRING = r'\b(' + '|'.join(map(re.escape, BANNED_WORDS)) + r')\b'
-BANNED_REGEX = re.compile(_PATTERN_STRING, re.IGNORECASE)
+# Lookalike letters spammers swap in to dodge the word list (Cyrillic / Greek / IPA)
+_HOMOGLYPHS = {
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o",
+    "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "ѕ": "s", "і": "i", "ї": "i",
+    "ј": "j", "ԁ": "d", "ԛ": "q", "ԝ": "w", "һ": "h", "ɑ": "a", "ɡ": "g", "ı": "i",
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+}
+_LEETSPEAK = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g", "@": "a", "$": "s"}
+_INVISIBLE = "\u00ad\u200b\u200c\u200d\u2060\ufeff"
+_APOSTROPHES = "'\u2019"  # "don't" -> "dont", so contractions don't leave stray single letters
 
-async def is_inappropriate(text: str) -> tuple[bool, str]:
-    if not text: 
+_FOLD_TABLE = str.maketrans({**_HOMOGLYPHS, **{ch: None for ch in _INVISIBLE + _APOSTROPHES}})
+_LEET_TABLE = str.maketrans(_LEETSPEAK)
+
+# Indic vowel signs are not \w to Python's re, so the Brahmic blocks count as word characters explicitly
+_SEPARATOR_RE = re.compile(r"(?:[^\w\u0300-\u036f\u0900-\u0963\u0966-\u0dff]|_)+")
+# The same, but keeping "@" and "$" inside words until leetspeak has been folded ("a$$" -> "ass")
+_LEET_SEPARATOR_RE = re.compile(r"(?:[^\w@$\u0300-\u036f\u0900-\u0963\u0966-\u0dff]|_)+")
+# "f u c k" / "f.u.c.k" -> "fuck": three or more single-character tokens in a row
+_SPACED_RE = re.compile(r"(?<!\S)(?:\S ){2,}\S(?!\S)")
+_REPEAT_RE = re.compile(r"(.)\1+")
+# Leetspeak is only folded in words that have a letter: "455/500" and "4 5 5" stay numbers
+_LETTER_RE = re.compile(r"[^\W\d_]")
+_WORD_WITH_LETTER_RE = re.compile(r"\S*[^\W\d_]\S*")
+
+def fold_text(text: str) -> str:
+    """Folds case, homoglyphs, leetspeak and separators into a space-delimited word stream."""
+    text = unicodedata.normalize("NFKC", text).casefold().translate(_FOLD_TABLE)
+    text = _LEET_SEPARATOR_RE.sub(" ", text).strip()
+    text = _SPACED_RE.sub(lambda m: m.group().replace(" ", "") if _LETTER_RE.search(m.group()) else m.group(), text)
+    text = _WORD_WITH_LETTER_RE.sub(lambda m: m.group().translate(_LEET_TABLE), text)
+    return _SEPARATOR_RE.sub(" ", text).strip()
+
+@lru_cache(maxsize=1024)
+def tokenize(text: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Returns (raw, collapsed) word tokens, index-aligned.
+
+    Cached: the abuse and duplicate checks both fold the same message back to back.
+    """
+    folded = fold_text(text)
+    if not folded: return (), ()
+    return tuple(folded.split(" ")), tuple(_REPEAT_RE.sub(r"\1", folded).split(" "))
+
+def _letter_runs(token: str) -> tuple[int, ...]:
+    return tuple(len(list(run)) for _, run in groupby(token))
+
+class AbuseMatcher:
+    """Aho-Corasick automaton over normalized word tokens.
+
+    Every entry is matched as whole words (the STRICT_BAD_WORDS contract), so "ass"
+    never fires inside "class". Letter repeats are collapsed on both sides and then
+    re-checked against the entry's own runs: "fuuuck" hits "fuck", "as" misses "ass".
+    """
+    __slots__ = ("_goto", "_fail", "_out", "words")
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._out = [[]]
+        self.words = set()
+        for word in words:
+            self._insert(word)
+        self._build_links()
+
+    def _insert(self, word: str):
+        raw, tokens = tokenize(word)
+        if not tokens: return
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._out.append([])
+                self._goto[state][token] = nxt
+            state = nxt
+
+        runs = tuple(_letter_runs(t) for t in raw)
+        if all(r == 1 for token_runs in runs for r in token_runs): runs = None
+        entry = (len(tokens), runs, word)
+        if any(e[:2] == entry[:2] for e in self._out[state]): return
+        self._out[state].append(entry)
+        self.words.add(word)
+
+    def _build_links(self):
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def match_tokens(self, raw: list[str], tokens: list[str], allowed: frozenset = frozenset()) -> str | None:
+        """Single left-to-right pass; returns the first matched entry not in `allowed` (vocab keys)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, runs, word in out[state]:
+                if allowed and " ".join(tokens[i - length + 1:i + 1]) in allowed: continue
+                if runs is None: return word
+                window = raw[i - length + 1:i + 1]
+                if all(a >= b for have, need in zip(window, runs) for a, b in zip(_letter_runs(have), need)):
+                    return word
+        return None
+
+    def search(self, text: str) -> str | None:
+        return self.match_tokens(*tokenize(text))
+
+def vocab_key(word: str) -> str:
+    """Normalized form used to compare a group's custom words against the automaton."""
+    return " ".join(tokenize(word)[1])
+
+# Built once at import; shared by every group
+ABUSE_MATCHER = AbuseMatcher(BANNED_WORDS)
+
+class ChatMatcher:
+    """A group's view of ABUSE_MATCHER: an overlay automaton for its own words plus an allow-list.
+
+    The shared automaton is never copied or recompiled per group; changing a group's
+    vocabulary only rebuilds its (small) overlay.
+    """
+    __slots__ = ("blocked", "allowed", "_overlay", "_allowed_keys")
+
+    def __init__(self, blocked=(), allowed=(), overlay: AbuseMatcher = None):
+        self.blocked = frozenset(blocked)
+        self.allowed = frozenset(allowed)
+        if overlay is None and self.blocked: overlay = AbuseMatcher(self.blocked)
+        self._overlay = overlay
+        self._allowed_keys = frozenset(vocab_key(w) for w in self.allowed)
+
+    def updated(self, block: str = None, allow: str = None, remove: str = None) -> "ChatMatcher":
+        """Returns a copy with one word changed, reusing the overlay when the blocked set is untouched."""
+        blocked, allowed = set(self.blocked), set(self.allowed)
+        for word in (block, allow, remove):
+            if word:
+                blocked.discard(word)
+                allowed.discard(word)
+        if block: blocked.add(block)
+        if allow: allowed.add(allow)
+        overlay = self._overlay if blocked == self.blocked else None
+        return ChatMatcher(blocked, allowed, overlay)
+
+    def search(self, text: str) -> str | None:
+        raw, tokens = tokenize(text)
+        if self._overlay:
+            hit = self._overlay.match_tokens(raw, tokens)
+            if hit: return hit
+        return ABUSE_MATCHER.match_tokens(raw, tokens, self._allowed_keys)
+
+# Groups without a custom vocabulary all share this instance
+DEFAULT_CHAT_MATCHER = ChatMatcher()
+
+async def is_inappropriate(text: str, matcher: ChatMatcher = DEFAULT_CHAT_MATCHER) -> tuple[bool, str]:
+    if not text:
         return False, ""
-        
-    if BANNED_REGEX.search(text):
+
+    if matcher.search(text):
         return True, "Banned vocabulary detected."
-            
-    return False, ""
\ No newline at end of file
+
+    return False, ""
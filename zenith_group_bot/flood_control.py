@@ -1,30 +1,89 @@
 import time
-from collections import deque
+from array import array
 from cachetools import TTLCache
 
-# Standard user spam tracking
-user_message_history = TTLCache(maxsize=10000, ttl=5.0)
+# (messages, seconds): trigger when this many messages land inside the window
+FLOOD_LIMITS = {
+    "low": (8, 3.0),
+    "medium": (5, 3.0),
+    "strict": (4, 3.0),
+}
+_RING = max(limit for limit, _ in FLOOD_LIMITS.values())
+_EMPTY_RING = array("d", [float("-inf")]) * _RING
 
 # Scenario 7: Tracks albums. If 10 photos are sent at once, they share a media_group_id.
 seen_albums = TTLCache(maxsize=5000, ttl=10.0)
 
-def is_flooding(user_id: int, media_group_id: str = None) -> tuple[bool, str]:
-    now = time.time()
-    
+class FloodEngine:
+    """Sliding-window message counter per (chat_id, user_id).
+
+    Each tracked pair owns a fixed slot of _RING timestamps inside one flat
+    array('d') plus a one-byte ring head, so 100k active users cost a few MB and
+    no per-user objects. Slots idle for longer than `idle_ttl` are recycled.
+    """
+    __slots__ = ("idle_ttl", "_slots", "_times", "_heads", "_free", "_last_sweep")
+
+    def __init__(self, capacity: int = 1024, idle_ttl: float = 60.0):
+        self.idle_ttl = idle_ttl
+        self._slots = {}
+        self._times = array("d", bytes(8 * _RING * capacity))
+        self._heads = array("B", bytes(capacity))
+        self._free = list(range(capacity - 1, -1, -1))
+        self._last_sweep = 0.0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def hit(self, chat_id: int, user_id: int, limit: int, window: float, now: float) -> bool:
+        """Records one message and reports whether it is the `limit`-th inside `window` seconds."""
+        key = (chat_id, user_id)
+        slot = self._slots.get(key)
+        if slot is None: slot = self._allocate(key, now)
+
+        base = slot * _RING
+        head = self._heads[slot]
+        times = self._times
+        times[base + head] = now
+        self._heads[slot] = (head + 1) % _RING
+        return now - times[base + (head - limit + 1) % _RING] < window
+
+    def _allocate(self, key, now: float) -> int:
+        if not self._free:
+            if now - self._last_sweep < self.idle_ttl or not self._sweep(now):
+                self._grow()
+        slot = self._free.pop()
+        base = slot * _RING
+        self._times[base:base + _RING] = _EMPTY_RING
+        self._heads[slot] = 0
+        self._slots[key] = slot
+        return slot
+
+    def _sweep(self, now: float) -> int:
+        self._last_sweep = now
+        times, heads, cutoff = self._times, self._heads, now - self.idle_ttl
+        idle = [key for key, slot in self._slots.items() if times[slot * _RING + (heads[slot] - 1) % _RING] < cutoff]
+        for key in idle:
+            self._free.append(self._slots.pop(key))
+        return len(idle)
+
+    def _grow(self):
+        capacity = len(self._heads)
+        self._times.extend(array("d", bytes(8 * _RING * capacity)))
+        self._heads.extend(array("B", bytes(capacity)))
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+flood_engine = FloodEngine()
+
+def is_flooding(chat_id: int, user_id: int, media_group_id: str = None, limits: tuple = FLOOD_LIMITS["medium"]) -> tuple[bool, str]:
+    """`limits` is one of FLOOD_LIMITS' (messages, seconds) pairs."""
     # Bypass spam counter if this message is part of an album we've already registered
     if media_group_id:
         if media_group_id in seen_albums:
             return False, ""
         seen_albums[media_group_id] = True
-    
-    if user_id not in user_message_history:
-        user_message_history[user_id] = deque(maxlen=5)
-        
-    history = user_message_history[user_id]
-    history.append(now)
-    
-    # Trigger if 5 unique messages arrive in under 3 seconds
-    if len(history) == 5 and (history[-1] - history[0] < 3.0):
+
+    limit, window = limits
+    if flood_engine.hit(chat_id, user_id, limit, window, time.monotonic()):
         return True, "Message Flooding (Spamming)"
-        
-    return False, ""
\ No newline at end of file
+
+    return False, ""
@@ -1,39 +1,73 @@
 import os
+import time
 import logging
 import asyncio
-from telegram import Update
-from telegram.constants import MessageEntityType
+from telegram import Update, ChatPermissions
 from telegram.error import Forbidden, BadRequest
 from telegram.ext import ApplicationBuilder, MessageHandler, CommandHandler, CallbackQueryHandler, ChatMemberHandler, filters, ContextTypes
 
-from zenith_group_bot.setup_flow import cmd_setup, cmd_start_dm, button_handler, cmd_deletegroup
-from zenith_group_bot.filters import is_inappropriate
-from zenith_group_bot.flood_control import is_flooding
-from zenith_group_bot.repository import init_group_db, MemberRepo, SettingsRepo, GroupRepo
+from zenith_group_bot.setup_flow import cmd_setup, cmd_start_dm, button_handler, cmd_deletegroup, cmd_vocab, cmd_stats
+from zenith_group_bot.raid_guard import raid_guard
+from zenith_group_bot.admin_roster import admin_roster
+from zenith_group_bot.policy import get_policy, QUARANTINE
+from zenith_group_bot.outbound import outbound, ENFORCE, WARNING, OWNER_DM
+from zenith_group_bot.cleanup import deletion_scheduler
+from zenith_group_bot.alert_digest import alert_digest
+from zenith_group_bot.event_log import event_log
+from zenith_group_bot.rollups import rollups
+from zenith_group_bot.warmup import warm_caches, save_snapshot, report_first_minute
+from zenith_group_bot import sharding
+from zenith_group_bot.sharding import ShardRouter, drain
+from zenith_group_bot.chat_order import ChatOrderedProcessor
+from core.webhook import start_ingress, stop_ingress
+from core.logger import setup_logger
+from core.metrics import registry, start_metrics_server
+from core.config import GROUP_SHARDS, CACHE_BUS
+from zenith_group_bot.repository import init_group_db, cache_bus, MemberRepo, SettingsRepo, GroupRepo
 
 logger = logging.getLogger("GROUP_BOT")
 
-async def animate_and_delete(context: ContextTypes.DEFAULT_TYPE, message, seconds: int = 5):
+_STAGES = {
+    stage: registry.histogram("zenith_group_stage_seconds", "Time per group_monitor_handler stage", stage=stage)
+    for stage in ("settings", "quarantine", "abuse", "flood", "duplicate", "strike", "telegram")
+}
+violations = registry.counter("zenith_group_violations_total", "Messages deleted for abuse or flooding")
+
+async def post_alert(context: ContextTypes.DEFAULT_TYPE, chat_id: int, text: str, collapse_key=None):
+    """Queues an in-chat notice that removes itself; shed silently when the chat is saturated."""
     try:
-        await asyncio.sleep(seconds)
-        await context.bot.delete_message(chat_id=message.chat_id, message_id=message.message_id)
-    except Exception: pass
+        alert = await outbound.submit(WARNING, chat_id, lambda: context.bot.send_message(chat_id=chat_id, text=text, parse_mode="HTML"), collapse_key)
+    except Exception as e:
+        return logger.debug(f"Could not post alert in {chat_id}: {e}")
+    if alert: deletion_scheduler.schedule(alert.chat_id, alert.message_id, 5)
 
-async def notify_owner(context: ContextTypes.DEFAULT_TYPE, chat_id: int, owner_id: int, group_name: str, username: str, reason: str, action: str):
+async def notify_owner(context: ContextTypes.DEFAULT_TYPE, chat_id: int, owner_id: int, group_name: str, username: str, reason: str, action: str, immediate: bool = False):
+    """Bans go out right away; everything else is folded into the owner's next digest."""
+    if not immediate:
+        return alert_digest.add(context.bot, chat_id, owner_id, group_name, username, reason, action)
     alert_text = f"🚨 <b>Zenith Security Alert</b>\n<b>Group:</b> {group_name}\n<b>User:</b> @{username}\n<b>Action:</b> {action}\n<b>Reason:</b> {reason}"
     try:
-        await context.bot.send_message(chat_id=owner_id, text=alert_text, parse_mode="HTML")
+        await outbound.submit(OWNER_DM, owner_id, lambda: context.bot.send_message(chat_id=owner_id, text=alert_text, parse_mode="HTML"))
     except Forbidden:
         # Scenario 4: The Silent Treatment (Owner blocked the bot). Fallback to public tag.
         fallback_text = f"🚨 <a href='tg://user?id={owner_id}'>Admin</a>, I caught a rule violation by @{username} but couldn't DM you because you blocked me! Please unblock me."
-        try: await context.bot.send_message(chat_id=chat_id, text=fallback_text, parse_mode="HTML")
+        try: await outbound.submit(WARNING, chat_id, lambda: context.bot.send_message(chat_id=chat_id, text=fallback_text, parse_mode="HTML"), ("blocked", chat_id))
         except: pass
     except Exception as e:
         logger.debug(f"Could not notify owner {owner_id}: {e}")
 
+def log_when_done(future, chat_id: int, user_id: int, message_id: int, action: str, reason: str, started: float, **counts: int):
+    """Event-logs an enforcement call nobody awaits, once it settles; `counts` go to the /stats rollups if it succeeded."""
+    def done(f):
+        failed = f.cancelled() or f.exception() is not None
+        event_log.record(chat_id, user_id, message_id, f"{action}_failed" if failed else action, reason, started)
+        if counts and not failed: rollups.add(chat_id, **counts)
+    future.add_done_callback(done)
+
 # Scenario 2: The Ghost Town (Bot gets kicked)
 async def my_chat_member_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     result = update.my_chat_member
+    admin_roster.apply(result, context.bot.id)
     if result.new_chat_member.status in ["left", "kicked", "banned"]:
         chat_id = result.chat.id
         settings = await SettingsRepo.get_settings(chat_id)
@@ -42,12 +76,16 @@ async def my_chat_member_handler(update: Update, context: ContextTypes.DEFAULT_T
             try: await context.bot.send_message(settings.owner_id, f"⚠️ I was removed from <b>{result.chat.title}</b>. Monitoring paused.", parse_mode="HTML")
             except: pass
 
+async def chat_member_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    admin_roster.apply(update.chat_member, context.bot.id)
+
 # Scenario 3: Identity Crisis (Group upgraded to Supergroup)
 async def handle_migration(update: Update, context: ContextTypes.DEFAULT_TYPE):
     old_id = update.message.migrate_from_chat_id
     new_id = update.message.chat_id
     if old_id and new_id:
         await SettingsRepo.migrate_chat_id(old_id, new_id)
+        admin_roster.forget(old_id)
         logger.info(f"🔄 Migrated ID {old_id} -> {new_id}")
 
 async def handle_new_members(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -58,15 +96,32 @@ async def handle_new_members(update: Update, context: ContextTypes.DEFAULT_TYPE)
             await context.bot.send_message(chat_id=chat_id, text=msg, parse_mode="HTML")
             return 
 
-    settings = await SettingsRepo.get_settings(chat_id)
-    if not settings or not settings.is_active: return
+    policy = await get_policy(chat_id)
+    if not policy or not policy.active: return
 
-    try: await update.message.delete()
-    except Exception: pass 
+    outbound.submit(ENFORCE, chat_id, update.message.delete)
 
-    for member in update.message.new_chat_members:
-        if not member.is_bot:
-            await MemberRepo.register_new_member(member.id, chat_id)
+    user_ids = [m.id for m in update.message.new_chat_members if not m.is_bot]
+    await MemberRepo.queue_new_members(chat_id, user_ids)
+    if user_ids: rollups.add(chat_id, joins=len(user_ids))
+
+    if policy.spam and user_ids:
+        started, to_restrict = raid_guard.record_joins(chat_id, user_ids, policy.raid_limits)
+        if to_restrict:
+            restrict_raiders(context, chat_id, to_restrict)
+        if started:
+            logger.warning(f"🚨 Join raid in {chat_id}: lockdown for {len(to_restrict)} newcomers")
+            outbound.submit(WARNING, chat_id, lambda: context.bot.send_message(chat_id=chat_id, text="🚨 <b>Raid Lockdown Active:</b>\nA wave of new accounts was detected. Newcomers are muted until the raid subsides.", parse_mode="HTML"))
+            context.application.create_task(notify_owner(context, chat_id, policy.owner_id, policy.group_name, "multiple accounts", "Join Raid Detected", f"LOCKDOWN - {len(to_restrict)} newcomers muted"))
+
+def restrict_raiders(context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_ids: list[int]):
+    # Restrictions expire with the lockdown, so relaxing needs no follow-up calls
+    started = time.perf_counter()
+    until = raid_guard.lockdown_until(chat_id)
+    muted = ChatPermissions(can_send_messages=False)
+    for user_id in user_ids:
+        call = outbound.submit(ENFORCE, chat_id, lambda uid=user_id: context.bot.restrict_chat_member(chat_id, uid, muted, until_date=until))
+        log_when_done(call, chat_id, user_id, None, "restrict", "Join Raid Detected", started)
 
 async def group_monitor_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message or update.message.from_user.is_bot: return
@@ -76,74 +131,165 @@ async def group_monitor_handler(update: Update, context: ContextTypes.DEFAULT_TY
     if msg.is_automatic_forward or msg.sender_chat or msg.from_user.id == 1087968824:
         return
 
+    started = time.perf_counter()
     user = update.effective_user
     chat_id = update.effective_chat.id
-    settings = await SettingsRepo.get_settings(chat_id)
-    if not settings or not settings.is_active: return
+    with _STAGES["settings"].time(): policy = await get_policy(chat_id)
+    if not policy or not policy.active: return
+    # Admins are never moderated; the roster is in memory, so this costs no API call
+    if admin_roster.is_admin(context.bot, chat_id, user.id): return
 
-    text = msg.text or msg.caption or ""
+    # Raid lockdown: newcomers' messages go without any DB lookups
+    if raid_guard.is_locked_newcomer(chat_id, user.id):
+        log_when_done(outbound.submit(ENFORCE, chat_id, msg.delete), chat_id, user.id, msg.message_id, "delete", "Raid Lockdown", started, deletions=1)
+        return
 
-    if settings.features in ["spam", "both"] and await MemberRepo.is_restricted(user.id, chat_id):
-        has_media = bool(msg.photo or msg.video or msg.document or msg.audio or msg.sticker or msg.animation)
-        has_link = any(e.type in [MessageEntityType.URL, MessageEntityType.TEXT_LINK] for e in (msg.entities or []) + (msg.caption_entities or []))
-        if has_media or has_link:
-            try: 
-                await msg.delete()
-                alert = await context.bot.send_message(chat_id=chat_id, text=f"🛡️ <b>Anti-Raid Active:</b>\n@{user.username}, new members cannot send links/media for 24 hours.", parse_mode="HTML")
-                context.application.create_task(animate_and_delete(context, alert, seconds=5))
-                await notify_owner(context, chat_id, settings.owner_id, settings.group_name, user.username, "Quarantine Media/Link Attempt", "Deleted Message")
-            except BadRequest: 
-                # Scenario 6: Demoted Bot
-                await notify_owner(context, chat_id, settings.owner_id, settings.group_name, user.username, "Quarantine Hit", "FAILED - Missing Delete Permission!")
-            return 
+    text = msg.text or msg.caption or ""
+    for stage, check in policy.checks:
+        with _STAGES[stage].time(): verdict = await check(policy, msg, user.id, text)
+        if verdict: break
+    else:
+        return
+    kind, reason = verdict
+    owner_id, group_name = policy.owner_id, policy.group_name
 
-    violation, reason = False, ""
-    
-    if settings.features in ["abuse", "both"]:
-        violation, reason = await is_inappropriate(text) 
-    
-    if settings.features in ["spam", "both"] and not violation and text: 
-        violation, reason = is_flooding(user.id, msg.media_group_id) # Passed media_group_id for Album Fix
-    
-    if violation:
-        try:
-            await msg.delete()
-            strikes = await GroupRepo.process_violation(user.id, chat_id)
-            if strikes >= 3:
-                await context.bot.ban_chat_member(chat_id, user.id)
-                alert = await context.bot.send_message(chat_id=chat_id, text=f"🚨 <b>BANNED:</b> @{user.username} for repeated violations.", parse_mode="HTML")
-                await notify_owner(context, chat_id, settings.owner_id, settings.group_name, user.username, reason, "BANNED USER")
-            else:
-                alert = await context.bot.send_message(chat_id=chat_id, text=f"🛡️ <b>WARNING:</b> @{user.username}, message deleted. Strike {strikes}/3.", parse_mode="HTML")
-                await notify_owner(context, chat_id, settings.owner_id, settings.group_name, user.username, reason, f"Deleted Message (Strike {strikes})")
-            context.application.create_task(animate_and_delete(context, alert, seconds=5))
-        except BadRequest as e:
+    if kind == QUARANTINE:
+        # The hit counts whether or not the delete goes through
+        rollups.add(chat_id, quarantine_hits=1)
+        try: 
+            with _STAGES["telegram"].time(): await outbound.submit(ENFORCE, chat_id, msg.delete)
+            event_log.record(chat_id, user.id, msg.message_id, "delete", reason, started)
+            rollups.add(chat_id, deletions=1)
+            context.application.create_task(post_alert(context, chat_id, f"🛡️ <b>Anti-Raid Active:</b>\n@{user.username}, new members cannot send links/media for 24 hours.", ("quarantine", chat_id, user.id)))
+            context.application.create_task(notify_owner(context, chat_id, owner_id, group_name, user.username, reason, "Deleted Message"))
+        except BadRequest: 
             # Scenario 6: Demoted Bot
-            if "delete" in str(e).lower() or "restrict" in str(e).lower():
-                await notify_owner(context, chat_id, settings.owner_id, settings.group_name, user.username, reason, "FAILED ENFORCEMENT - Admin Rights Revoked!")
-        except Exception as e: 
-            logger.error(f"Moderation Error: {e}")
+            event_log.record(chat_id, user.id, msg.message_id, "delete_failed", reason, started)
+            context.application.create_task(notify_owner(context, chat_id, owner_id, group_name, user.username, "Quarantine Hit", "FAILED - Missing Delete Permission!"))
+        return 
 
-async def start_group_bot():
-    token = os.getenv("GROUP_BOT_TOKEN")
-    await init_group_db()
+    # Each step is logged as it lands, so a later failure can't hide what already happened
+    step = "delete"
+    try:
+        with _STAGES["telegram"].time(): await outbound.submit(ENFORCE, chat_id, msg.delete)
+        event_log.record(chat_id, user.id, msg.message_id, "delete", reason, started)
+        rollups.add(chat_id, deletions=1)
+        step = "strike"
+        with _STAGES["strike"].time(): strikes = await GroupRepo.process_violation(user.id, chat_id)
+        violations.inc()
+        rollups.add(chat_id, strikes=1)
+        if strikes >= 3:
+            step = "ban"
+            with _STAGES["telegram"].time(): await outbound.submit(ENFORCE, chat_id, lambda: context.bot.ban_chat_member(chat_id, user.id))
+            event_log.record(chat_id, user.id, msg.message_id, "ban", reason, started)
+            rollups.add(chat_id, bans=1)
+            alert_text, action = f"🚨 <b>BANNED:</b> @{user.username} for repeated violations.", "BANNED USER"
+        else:
+            alert_text, action = f"🛡️ <b>WARNING:</b> @{user.username}, message deleted. Strike {strikes}/3.", f"Deleted Message (Strike {strikes})"
+        # A newer alert for the same user replaces one still waiting in the queue
+        context.application.create_task(post_alert(context, chat_id, alert_text, ("alert", chat_id, user.id)))
+        context.application.create_task(notify_owner(context, chat_id, owner_id, group_name, user.username, reason, action, immediate=strikes >= 3))
+    except BadRequest as e:
+        # Scenario 6: Demoted Bot
+        event_log.record(chat_id, user.id, msg.message_id, f"{step}_failed", reason, started)
+        if "delete" in str(e).lower() or "restrict" in str(e).lower():
+            context.application.create_task(notify_owner(context, chat_id, owner_id, group_name, user.username, reason, "FAILED ENFORCEMENT - Admin Rights Revoked!"))
+    except Exception as e: 
+        event_log.record(chat_id, user.id, msg.message_id, f"{step}_failed", reason, started)
+        logger.error(f"Moderation Error ({step}): {e}")
 
-    app = ApplicationBuilder().token(token).build()
+def build_group_app(token: str = None, bot=None):
+    """The group bot's Application with every handler registered; pass `bot` to replace the Telegram client."""
+    # Handlers no longer wait on warnings or DMs, so different chats' updates run side by side;
+    # each chat's stay in order (flood counts, strikes, joins vs. lockdown, /setup flows).
+    # The outbound scheduler is what keeps us inside Telegram's limits.
+    builder = ApplicationBuilder().concurrent_updates(ChatOrderedProcessor(256))
+    app = (builder.bot(bot) if bot is not None else builder.token(token)).build()
     
     app.add_handler(CommandHandler("start", cmd_start_dm))
     app.add_handler(CommandHandler("setup", cmd_setup))
     app.add_handler(CommandHandler("deletegroup", cmd_deletegroup))
+    app.add_handler(CommandHandler(["addword", "allowword", "delword"], cmd_vocab))
+    app.add_handler(CommandHandler("stats", cmd_stats))
     app.add_handler(CallbackQueryHandler(button_handler))
     
     # Core Scenarios Handlers
     app.add_handler(ChatMemberHandler(my_chat_member_handler, ChatMemberHandler.MY_CHAT_MEMBER))
+    app.add_handler(ChatMemberHandler(chat_member_handler, ChatMemberHandler.CHAT_MEMBER))
     app.add_handler(MessageHandler(filters.StatusUpdate.MIGRATE, handle_migration))
     app.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, handle_new_members))
     app.add_handler(MessageHandler(filters.ChatType.GROUPS & (~filters.COMMAND) & (~filters.StatusUpdate.ALL), group_monitor_handler))
+    return app
+
+async def start_group_bot(feed=None):
+    """Runs the group bot. `feed(app)` replaces the normal ingress when a shard router supplies updates."""
+    token = os.getenv("GROUP_BOT_TOKEN")
+    await init_group_db()
+
+    # Other replicas' /setup and /deletegroup writes reach our caches through this listener.
+    # It clears every cache when it connects, so it has to be up before the caches are warmed.
+    invalidation_listener = asyncio.create_task(cache_bus.listen())
+    try: await asyncio.wait_for(cache_bus.connected.wait(), 10)
+    except asyncio.TimeoutError: logger.warning("Cache invalidation listener not connected yet; warmed caches will be dropped when it is")
+    await warm_caches()
+
+    app = build_group_app(token)
+    outbound.start()
+    event_log.start()
+    rollups.start()
 
+    await start_metrics_server(port_offset=0 if sharding.SHARD_COUNT == 1 else 1 + sharding.SHARD_INDEX)
     await app.initialize()
+    await deletion_scheduler.start(app.bot)
     await app.start()
-    await app.updater.start_polling()
+    if feed is None: await start_ingress(app, "group")
     
     logger.info("ZENITH SUPREME SAAS: ALL SHIELDS ONLINE")
-    await asyncio.Event().wait()
\ No newline at end of file
+    query_report = asyncio.create_task(report_first_minute())
+    try:
+        if feed is None: await asyncio.Event().wait()
+        else: await feed(app)
+    finally:
+        invalidation_listener.cancel()
+        query_report.cancel()
+        if feed is None: await stop_ingress(app, "group")
+        await app.stop()
+        await app.shutdown()
+        await alert_digest.flush_all()
+        await deletion_scheduler.stop()
+        await outbound.stop()
+        await event_log.stop()
+        await rollups.stop()
+        save_snapshot()
+
+async def start_sharded_group_bot():
+    """Ingress process for GROUP_SHARDS > 1: receives updates and routes each chat to one worker process."""
+    if CACHE_BUS != "postgres":
+        logger.warning("GROUP_SHARDS > 1 with CACHE_BUS=local: settings changed in one shard won't reach the others")
+    app = ApplicationBuilder().token(os.getenv("GROUP_BOT_TOKEN")).build()
+    router = ShardRouter(GROUP_SHARDS, run_group_shard)
+    router.start()
+    await start_metrics_server()
+    await app.initialize()
+    await start_ingress(app, "group")
+    logger.info(f"🔀 Routing group updates to {GROUP_SHARDS} shards")
+    try:
+        while True:
+            router.route((await app.update_queue.get()).to_dict())
+    finally:
+        await stop_ingress(app, "group")
+        await app.shutdown()
+        await router.stop()
+
+def run_group_shard(index: int, count: int, queue):
+    """Worker process entry point: one event loop owning every chat with chat_id % count == index."""
+    setup_logger(f"GROUP_SHARD_{index}")
+    sharding.configure(index, count)
+    # Telegram's global send limit is per bot token, so the shards split it
+    outbound.global_bucket.rate /= count
+
+    async def feed(app):
+        await drain(queue, lambda data: app.update_queue.put_nowait(Update.de_json(data, app.bot)))
+
+    try: asyncio.run(start_group_bot(feed))
+    except KeyboardInterrupt: pass
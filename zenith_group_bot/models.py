@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, DateTime, UniqueConstraint, String, Boolean
+from sqlalchemy import Column, Integer, BigInteger, DateTime, UniqueConstraint, String, Boolean, Float, Index, Table
 from sqlalchemy.orm import declarative_base
 from utils.time_util import utc_now
 
@@ -21,7 +21,11 @@ class GroupStrike(Base):
     chat_id = Column(BigInteger, index=True)
     strike_count = Column(Integer, default=0)
     last_violation = Column(DateTime, nullable=True)
-    __table_args__ = (UniqueConstraint('user_id', 'chat_id', name='_user_chat_uc'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'chat_id', name='_user_chat_uc'),
+        # The AI bot's ban refresh polls banned rows by last_violation; the partial index stays small
+        Index("ix_group_strikes_banned", "last_violation", "user_id", postgresql_where=strike_count >= 3),
+    )
 
 class NewMember(Base):
     __tablename__ = "zenith_new_members"
@@ -29,4 +33,48 @@ class NewMember(Base):
     user_id = Column(BigInteger, index=True)
     chat_id = Column(BigInteger, index=True)
     joined_at = Column(DateTime, default=utc_now)
-    __table_args__ = (UniqueConstraint('user_id', 'chat_id', name='_new_member_chat_uc'),)
\ No newline at end of file
+    __table_args__ = (UniqueConstraint('user_id', 'chat_id', name='_new_member_chat_uc'),)
+
+class GroupWord(Base):
+    __tablename__ = "zenith_group_words"
+    id = Column(Integer, primary_key=True)
+    chat_id = Column(BigInteger, index=True)
+    word = Column(String, nullable=False)
+    is_allowed = Column(Boolean, default=False)
+    added_at = Column(DateTime, default=utc_now)
+    __table_args__ = (UniqueConstraint('chat_id', 'word', name='_chat_word_uc'),)
+
+class PendingDeletion(Base):
+    __tablename__ = "zenith_pending_deletions"
+    id = Column(Integer, primary_key=True)
+    chat_id = Column(BigInteger, nullable=False)
+    message_id = Column(BigInteger, nullable=False)
+    delete_at = Column(DateTime, index=True)
+    __table_args__ = (UniqueConstraint('chat_id', 'message_id', name='_pending_delete_uc'),)
+
+class GroupStatsBucket(Base):
+    """Pre-summed moderation counters for /stats: one row per chat per hour ("h") and per day ("d")."""
+    __tablename__ = "zenith_group_stats"
+    chat_id = Column(BigInteger, primary_key=True)
+    granularity = Column(String(1), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    deletions = Column(Integer, nullable=False, default=0)
+    strikes = Column(Integer, nullable=False, default=0)
+    bans = Column(Integer, nullable=False, default=0)
+    joins = Column(Integer, nullable=False, default=0)
+    quarantine_hits = Column(Integer, nullable=False, default=0)
+
+# Append-only and range-partitioned by day; rows arrive by COPY from event_log.py, which also
+# creates each day's partition. Retention drops whole partitions instead of deleting rows.
+moderation_events = Table(
+    "zenith_moderation_events", Base.metadata,
+    Column("created_at", DateTime, nullable=False),
+    Column("chat_id", BigInteger, nullable=False),
+    Column("user_id", BigInteger),
+    Column("message_id", BigInteger),
+    Column("action", String, nullable=False),
+    Column("reason", String),
+    Column("latency_ms", Float),
+    Index("ix_moderation_events_chat_time", "chat_id", "created_at"),
+    postgresql_partition_by="RANGE (created_at)",
+)
@@ -0,0 +1,189 @@
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+from datetime import timedelta
+from telegram.error import RetryAfter
+
+from core.metrics import registry
+
+logger = logging.getLogger("OUTBOUND")
+
+# Lower runs first. Enforcement must never queue behind chatter.
+ENFORCE = 0   # delete / ban / restrict
+WARNING = 1   # in-chat notices
+OWNER_DM = 2  # alerts to group owners
+CLEANUP = 3   # removing our own expired notices
+_SENDS = (WARNING, OWNER_DM)
+_CALL_SECONDS = {
+    priority: registry.histogram("zenith_telegram_call_seconds", "Telegram API call latency by outbound priority", priority=name)
+    for priority, name in ((ENFORCE, "enforce"), (WARNING, "warning"), (OWNER_DM, "owner_dm"), (CLEANUP, "cleanup"))
+}
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated", "blocked_until")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate, self.burst = rate, burst
+        self.tokens, self.updated = burst, time.monotonic()
+        self.blocked_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 = available now). Does not consume."""
+        if now < self.blocked_until: return self.blocked_until - now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+class _Job:
+    __slots__ = ("priority", "chat_id", "call", "future", "collapse_key", "attempts")
+
+    def __init__(self, priority, chat_id, call, future, collapse_key):
+        self.priority, self.chat_id, self.call = priority, chat_id, call
+        self.future, self.collapse_key, self.attempts = future, collapse_key, 0
+
+class OutboundScheduler:
+    """Single funnel for the group bot's Telegram API calls.
+
+    Workers always take the most urgent call first. Sends (warnings and DMs) must also
+    hold a token from the global bucket (Telegram's ~30 msg/s) and from a per-chat bucket
+    (~20 msg/min per group). Under pressure, warnings that can't go out right away are
+    dropped, calls sharing a collapse_key merge into the newest one, and a 429 pauses
+    only the chat (and kind of call) that caused it.
+    """
+    def __init__(self, global_rate: float = 25.0, global_burst: float = 5, chat_rate: float = 20 / 60,
+                 chat_burst: float = 3, workers: int = 16, max_pending: int = 1000, max_attempts: int = 3):
+        # A small global burst keeps any one-second window under Telegram's cap
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_rate, self.chat_burst = chat_rate, chat_burst
+        self.workers, self.max_pending, self.max_attempts = workers, max_pending, max_attempts
+        self._chat_buckets = {}
+        self._enforce_paused = {}  # chat_id -> monotonic deadline after a 429 on a moderation call
+        self._heap = []
+        self._collapsible = {}
+        self._seq = itertools.count()
+        self._ready = None
+        self._tasks = []
+        self.stats = {"sent": 0, "dropped": 0, "collapsed": 0, "retried": 0}
+
+    def start(self):
+        if self._tasks: return
+        self._ready = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks: task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Nothing will run what's left; cancel it so awaiting callers don't hang
+        for _, _, job in self._heap: job.future.cancel()
+        self._heap.clear()
+        self._collapsible.clear()
+
+    def submit(self, priority: int, chat_id: int, call, collapse_key=None) -> asyncio.Future:
+        """Queues `call` (a zero-arg callable returning an awaitable). The future resolves to its
+        result, raises its error, or resolves to None if the call was shed."""
+        self.start()
+        if collapse_key is not None and collapse_key in self._collapsible:
+            job = self._collapsible[collapse_key]
+            job.call = call
+            self.stats["collapsed"] += 1
+            return job.future
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        if priority in _SENDS and len(self._heap) >= self.max_pending:
+            self.stats["dropped"] += 1
+            future.set_result(None)
+            return future
+
+        job = _Job(priority, chat_id, call, future, collapse_key)
+        if collapse_key is not None: self._collapsible[collapse_key] = job
+        self._push(job)
+        return future
+
+    def _push(self, job: _Job):
+        if not self._tasks:  # a delayed retry firing after stop()
+            job.future.cancel()
+            return
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        self._ready.set()
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) > 50000: self._chat_buckets.clear()
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    async def _worker(self):
+        while True:
+            while not self._heap:
+                self._ready.clear()
+                await self._ready.wait()
+            _, _, job = heapq.heappop(self._heap)
+            if job.collapse_key is not None: self._collapsible.pop(job.collapse_key, None)
+
+            now = time.monotonic()
+            bucket = self._chat_bucket(job.chat_id)
+            if job.priority in _SENDS:
+                wait = max(bucket.wait_time(now), self.global_bucket.wait_time(now))
+            else:
+                wait = self._enforce_paused.get(job.chat_id, 0.0) - now
+                if wait <= 0: self._enforce_paused.pop(job.chat_id, None)
+            if wait > 0:
+                if job.priority == WARNING:
+                    # In-chat notices are ephemeral; one arriving late is worth less than the slot
+                    self.stats["dropped"] += 1
+                    _resolve(job.future, None)
+                else:
+                    asyncio.get_running_loop().call_later(wait, self._push, job)
+                continue
+
+            if job.priority in _SENDS:
+                bucket.take()
+                self.global_bucket.take()
+            await self._run(job)
+
+    async def _run(self, job: _Job):
+        job.attempts += 1
+        try:
+            with _CALL_SECONDS[job.priority].time(): result = await job.call()
+        except RetryAfter as e:
+            delay = e.retry_after
+            delay = delay.total_seconds() if isinstance(delay, timedelta) else float(delay)
+            # Telegram throttles sends and moderation calls separately; a 429 on one doesn't stall the other
+            if job.priority in _SENDS: self._chat_bucket(job.chat_id).blocked_until = time.monotonic() + delay
+            else: self._enforce_paused[job.chat_id] = time.monotonic() + delay
+            if job.attempts < self.max_attempts:
+                self.stats["retried"] += 1
+                logger.warning(f"429 for chat {job.chat_id}; retrying in {delay:.0f}s")
+                asyncio.get_running_loop().call_later(delay, self._push, job)
+            else:
+                _resolve(job.future, error=e)
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as e:
+            _resolve(job.future, error=e)
+        else:
+            self.stats["sent"] += 1
+            _resolve(job.future, result)
+
+def _resolve(future: asyncio.Future, result=None, error: Exception = None):
+    if future.done(): return  # the caller gave up (cancelled) while we were working
+    if error is not None: future.set_exception(error)
+    else: future.set_result(result)
+
+def _consume_exception(future: asyncio.Future):
+    # Fire-and-forget callers never await; don't let asyncio log their errors as unretrieved
+    if not future.cancelled(): future.exception()
+
+outbound = OutboundScheduler()
+registry.gauge("zenith_outbound_pending", "Telegram calls waiting in the outbound scheduler", fn=lambda: len(outbound._heap))
+for _stat in outbound.stats:
+    registry.gauge("zenith_outbound_calls", "Outbound scheduler totals by outcome", fn=lambda k=_stat: outbound.stats[k], outcome=_stat)
@@ -0,0 +1,95 @@
+from typing import NamedTuple
+from cachetools import LRUCache
+from telegram.constants import MessageEntityType
+
+from zenith_group_bot.filters import is_inappropriate
+from zenith_group_bot.flood_control import is_flooding, FLOOD_LIMITS
+from zenith_group_bot.raid_guard import RAID_LIMITS
+from zenith_group_bot.duplicate_guard import duplicate_guard, DUPLICATE_LIMITS
+from zenith_group_bot.outbound import outbound, ENFORCE
+from zenith_group_bot.rollups import rollups
+from zenith_group_bot.repository import SettingsRepo, MemberRepo, VocabRepo
+from core.config import SETTINGS_CACHE_SIZE
+
+_LINK_TYPES = frozenset((MessageEntityType.URL, MessageEntityType.TEXT_LINK))
+_PROMO_TYPES = _LINK_TYPES | {MessageEntityType.MENTION, MessageEntityType.TEXT_MENTION}
+
+# Verdict kinds: a quarantine hit only deletes; a strike also counts towards the ban
+QUARANTINE, STRIKE = "quarantine", "strike"
+
+def has_media_or_link(msg) -> bool:
+    if msg.photo or msg.video or msg.document or msg.audio or msg.sticker or msg.animation: return True
+    return any(e.type in _LINK_TYPES for e in (*msg.entities, *msg.caption_entities))
+
+# Each check returns None or (kind, reason). The local predicate in front of each one
+# decides whether its lookup (DB on a cache miss) is worth doing at all.
+async def check_quarantine(policy, msg, user_id: int, text: str):
+    if not has_media_or_link(msg): return None
+    if await MemberRepo.is_restricted(user_id, policy.chat_id): return QUARANTINE, "Quarantine Media/Link Attempt"
+
+async def check_abuse(policy, msg, user_id: int, text: str):
+    if not text: return None
+    violation, reason = await is_inappropriate(text, await VocabRepo.get_matcher(policy.chat_id))
+    if violation: return STRIKE, reason
+
+async def check_flood(policy, msg, user_id: int, text: str):
+    if not text: return None
+    violation, reason = is_flooding(policy.chat_id, user_id, msg.media_group_id, policy.flood_limits)
+    if violation: return STRIKE, reason
+
+async def check_duplicate(policy, msg, user_id: int, text: str):
+    if not text: return None
+    entities = (*msg.entities, *msg.caption_entities)
+    links = tuple(e.url for e in entities if e.type == MessageEntityType.TEXT_LINK)
+    promo = any(e.type in _PROMO_TYPES for e in entities)
+    raid, earlier = duplicate_guard.check(policy.chat_id, user_id, msg.message_id, text, policy.duplicate_limits, links, promo)
+    if not raid: return None
+    if earlier:
+        outbound.submit(ENFORCE, policy.chat_id, lambda: msg.get_bot().delete_messages(policy.chat_id, earlier))
+        rollups.add(policy.chat_id, deletions=len(earlier))
+    return STRIKE, "Copy-Paste Spam (same message from several accounts)"
+
+class GroupPolicy(NamedTuple):
+    """A chat's settings compiled for the hot path.
+
+    `checks` lists (stage, check) in the order group_monitor_handler runs them, holding
+    only the ones the chat's features enable; the first verdict wins. Strength is
+    resolved into flood, raid and duplicate thresholds once, here, instead of per message.
+    """
+    source: object  # the GroupSettings record this was compiled from
+    chat_id: int
+    owner_id: int
+    group_name: str
+    active: bool
+    spam: bool
+    flood_limits: tuple
+    raid_limits: tuple
+    duplicate_limits: tuple
+    checks: tuple
+
+    @classmethod
+    def compile(cls, settings) -> "GroupPolicy":
+        spam, abuse = settings.features in ("spam", "both"), settings.features in ("abuse", "both")
+        checks = []
+        if spam: checks.append(("quarantine", check_quarantine))
+        if abuse: checks.append(("abuse", check_abuse))
+        if spam: checks.extend((("flood", check_flood), ("duplicate", check_duplicate)))
+        return cls(
+            source=settings, chat_id=settings.chat_id, owner_id=settings.owner_id, group_name=settings.group_name,
+            active=bool(settings.is_active), spam=spam,
+            flood_limits=FLOOD_LIMITS.get(settings.strength, FLOOD_LIMITS["medium"]),
+            raid_limits=RAID_LIMITS.get(settings.strength, RAID_LIMITS["medium"]),
+            duplicate_limits=DUPLICATE_LIMITS.get(settings.strength, DUPLICATE_LIMITS["medium"]),
+            checks=tuple(checks),
+        )
+
+# chat_id -> GroupPolicy; recompiled whenever settings_cache hands out a different record
+_policies = LRUCache(maxsize=SETTINGS_CACHE_SIZE)
+
+async def get_policy(chat_id: int) -> GroupPolicy | None:
+    settings = await SettingsRepo.get_settings(chat_id)
+    if settings is None: return None
+    policy = _policies.get(chat_id)
+    if policy is None or policy.source is not settings:
+        policy = _policies[chat_id] = GroupPolicy.compile(settings)
+    return policy
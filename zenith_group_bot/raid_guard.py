@@ -0,0 +1,64 @@
+import time
+from collections import deque
+
+# (joins, seconds, lockdown seconds): this many joins inside the window locks the chat down
+RAID_LIMITS = {
+    "low": (30, 60.0, 600.0),
+    "medium": (15, 60.0, 900.0),
+    "strict": (8, 60.0, 1800.0),
+}
+
+class RaidGuard:
+    """Join-rate raid detector and per-chat lockdown state, all in memory.
+
+    Each chat keeps only its last `limit` joins, so the rate check is O(1) per join:
+    the window is exceeded exactly when the oldest of those is younger than `window`.
+    A lockdown lasts `lockdown` seconds past the latest join and then lifts on its own.
+    """
+    __slots__ = ("_joins", "_lockdowns", "_newcomers")
+
+    def __init__(self):
+        self._joins = {}       # chat_id -> deque[(monotonic, user_id)]
+        self._lockdowns = {}   # chat_id -> monotonic deadline
+        self._newcomers = {}   # chat_id -> user_ids restricted by the current lockdown
+
+    def record_joins(self, chat_id: int, user_ids: list[int], limits: tuple, now: float = None) -> tuple[bool, list[int]]:
+        """Returns (lockdown_started, users_to_restrict). `limits` is one of RAID_LIMITS' entries."""
+        now = time.monotonic() if now is None else now
+        limit, window, lockdown = limits
+
+        joins = self._joins.get(chat_id)
+        if joins is None or joins.maxlen != limit:
+            joins = self._joins[chat_id] = deque(joins or (), maxlen=limit)
+        for user_id in user_ids: joins.append((now, user_id))
+
+        if self.is_locked_down(chat_id, now):
+            self._lockdowns[chat_id] = now + lockdown
+            self._newcomers[chat_id].update(user_ids)
+            return False, list(user_ids)
+
+        if len(joins) == limit and now - joins[0][0] < window:
+            self._lockdowns[chat_id] = now + lockdown
+            raiders = {user_id for _, user_id in joins}.union(user_ids)
+            self._newcomers[chat_id] = raiders
+            joins.clear()
+            return True, list(raiders)
+        return False, []
+
+    def is_locked_down(self, chat_id: int, now: float = None) -> bool:
+        deadline = self._lockdowns.get(chat_id)
+        if deadline is None: return False
+        if (time.monotonic() if now is None else now) < deadline: return True
+        # Relax: the Telegram restrictions we issued carry the same deadline
+        del self._lockdowns[chat_id]
+        self._newcomers.pop(chat_id, None)
+        return False
+
+    def is_locked_newcomer(self, chat_id: int, user_id: int) -> bool:
+        return chat_id in self._lockdowns and self.is_locked_down(chat_id) and user_id in self._newcomers[chat_id]
+
+    def lockdown_until(self, chat_id: int) -> int:
+        """Wall-clock epoch seconds when the chat's lockdown ends (for restrict until_date)."""
+        return int(time.time() + self._lockdowns.get(chat_id, time.monotonic()) - time.monotonic())
+
+raid_guard = RaidGuard()
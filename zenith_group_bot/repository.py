@@ -1,22 +1,81 @@
+import time
+import asyncio
+import logging
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, delete, update
-from datetime import timedelta
-from cachetools import TTLCache
+from sqlalchemy import select, delete, update, event, tuple_, text, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta, timezone, date
+from cachetools import TTLCache, LRUCache
 
-from zenith_group_bot.models import Base, GroupStrike, NewMember, GroupSettings
-from core.config import DATABASE_URL, DB_POOL_SIZE
+from zenith_group_bot.models import Base, GroupStrike, NewMember, GroupSettings, GroupWord, PendingDeletion, GroupStatsBucket, moderation_events
+from zenith_group_bot.filters import ChatMatcher, DEFAULT_CHAT_MATCHER
+from zenith_group_bot.cache_bus import CacheBus, PostgresCacheBus
+from core.config import (
+    DATABASE_URL, DB_POOL_SIZE, STRIKE_COALESCE_MS, JOIN_BATCH_MS, QUARANTINE_CACHE_SIZE,
+    CACHE_BUS, SETTINGS_CACHE_TTL, SETTINGS_CACHE_SIZE,
+)
+from core.metrics import registry, ratio
 from utils.time_util import utc_now
 
+logger = logging.getLogger("GROUP_REPO")
+
 engine = create_async_engine(DATABASE_URL, pool_size=DB_POOL_SIZE, max_overflow=20, pool_pre_ping=True)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-settings_cache = TTLCache(maxsize=1000, ttl=300)      
-quarantine_cache = TTLCache(maxsize=50000, ttl=3600)  
+db_stats = {"queries": 0}
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_query(*_):
+    db_stats["queries"] += 1
+
+# chat_id -> GroupSettings, or None for chats that never ran /setup. Kept fresh by cache_bus, so the TTL is only a backstop
+settings_cache = TTLCache(maxsize=SETTINGS_CACHE_SIZE, ttl=SETTINGS_CACHE_TTL)
+# (chat_id, user_id) -> quarantine expiry as epoch seconds; 0.0 means never quarantined
+quarantine_cache = TTLCache(maxsize=QUARANTINE_CACHE_SIZE, ttl=3600)
+quarantine_stats = {"hits": 0, "misses": 0}
+QUARANTINE_WINDOW = timedelta(hours=24)
+settings_hits = registry.counter("zenith_settings_cache_total", "settings_cache lookups", result="hit")
+settings_misses = registry.counter("zenith_settings_cache_total", "settings_cache lookups", result="miss")
+registry.gauge("zenith_settings_cache_hit_ratio", fn=ratio(settings_hits, settings_misses))
+registry.gauge("zenith_settings_cache_size", fn=lambda: len(settings_cache))
+registry.gauge("zenith_quarantine_cache_hit_ratio", fn=lambda: MemberRepo.quarantine_cache_info()["hit_ratio"])
+registry.gauge("zenith_quarantine_cache_size", fn=lambda: len(quarantine_cache))
+# Settings invalidation clock: a read that started before a chat's last invalidation must not be cached
+settings_clock = {"now": 0, "cleared": 0}
+settings_changed = {}  # chat_id -> settings_clock["now"] at its last invalidation
+
+def invalidate_settings(chat_id: int | None):
+    """Drops the cached settings (all of them for None) and fences off reads already in flight."""
+    settings_clock["now"] += 1
+    if chat_id is None:
+        settings_clock["cleared"] = settings_clock["now"]
+        settings_changed.clear()
+        settings_cache.clear()
+    else:
+        settings_changed[chat_id] = settings_clock["now"]
+        settings_cache.pop(chat_id, None)
+
+def settings_unchanged_since(chat_id: int, started: int) -> bool:
+    return settings_clock["cleared"] <= started and settings_changed.get(chat_id, 0) <= started
+
+vocab_cache = LRUCache(maxsize=5000)     # chat_id -> (version, ChatMatcher)
+vocab_versions = {}                      # chat_id -> bumped on every vocabulary write
+
+if CACHE_BUS == "postgres":
+    cache_bus = PostgresCacheBus(engine.url.set(drivername="postgresql").render_as_string(hide_password=False))
+else:
+    cache_bus = CacheBus()
 
 async def init_group_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+
+def _create_missing_indexes(conn):
+    # create_all skips tables that already exist, along with any index added to them since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes: index.create(conn, checkfirst=True)
 
 async def dispose_group_engine():
     await engine.dispose()
@@ -24,12 +83,17 @@ async def dispose_group_engine():
 class SettingsRepo:
     @staticmethod
     async def get_settings(chat_id: int):
-        if chat_id in settings_cache: return settings_cache[chat_id]
+        if chat_id in settings_cache:
+            settings_hits.inc()
+            return settings_cache[chat_id]
+        settings_misses.inc()
+        started = settings_clock["now"]
         async with AsyncSessionLocal() as session:
             stmt = select(GroupSettings).where(GroupSettings.chat_id == chat_id)
             record = (await session.execute(stmt)).scalar_one_or_none()
-            if record: settings_cache[chat_id] = record
-            return record
+        # A write or peer invalidation that landed while we were reading; don't cache the stale row
+        if settings_unchanged_since(chat_id, started): settings_cache[chat_id] = record
+        return record
 
     @staticmethod
     async def get_owned_groups(owner_id: int):
@@ -51,7 +115,9 @@ class SettingsRepo:
             if strength: record.strength = strength
             if is_active is not None: record.is_active = is_active
             
+            await cache_bus.publish(session, "settings", chat_id)
             await session.commit()
+            invalidate_settings(chat_id)
             settings_cache[chat_id] = record
             return record
 
@@ -62,7 +128,9 @@ class SettingsRepo:
             record = (await session.execute(stmt)).scalar_one_or_none()
             if record:
                 record.is_active = is_active
+                await cache_bus.publish(session, "settings", chat_id)
                 await session.commit()
+                invalidate_settings(chat_id)
                 settings_cache[chat_id] = record
             return record
 
@@ -72,8 +140,14 @@ class SettingsRepo:
             await session.execute(update(GroupSettings).where(GroupSettings.chat_id == old_id).values(chat_id=new_id))
             await session.execute(update(GroupStrike).where(GroupStrike.chat_id == old_id).values(chat_id=new_id))
             await session.execute(update(NewMember).where(NewMember.chat_id == old_id).values(chat_id=new_id))
+            await session.execute(update(GroupWord).where(GroupWord.chat_id == old_id).values(chat_id=new_id))
+            for chat_id in (old_id, new_id):
+                await cache_bus.publish(session, "settings", chat_id)
+                await cache_bus.publish(session, "vocab", chat_id)
             await session.commit()
-            settings_cache.pop(old_id, None)
+            for chat_id in (old_id, new_id):
+                invalidate_settings(chat_id)
+                VocabRepo.invalidate(chat_id)
 
     @staticmethod
     async def wipe_group_container(chat_id: int, owner_id: int) -> bool:
@@ -82,49 +156,394 @@ class SettingsRepo:
             if not (await session.execute(stmt)).scalar_one_or_none(): return False
             await session.execute(delete(GroupStrike).where(GroupStrike.chat_id == chat_id))
             await session.execute(delete(NewMember).where(NewMember.chat_id == chat_id))
+            await session.execute(delete(GroupWord).where(GroupWord.chat_id == chat_id))
             await session.execute(delete(GroupSettings).where(GroupSettings.chat_id == chat_id))
+            await cache_bus.publish(session, "settings", chat_id)
+            await cache_bus.publish(session, "vocab", chat_id)
             await session.commit()
-            settings_cache.pop(chat_id, None)
+            invalidate_settings(chat_id)
+            VocabRepo.invalidate(chat_id)
             return True
 
+class StrikeCoalescer:
+    """Merges violations from the same (user, chat) that land within a few ms into one upsert.
+
+    Each caller still gets its own strike number: three merged violations on top of
+    an existing strike resolve to 2, 3 and 4.
+    """
+    def __init__(self, window_ms: int):
+        self.window = window_ms / 1000
+        self._pending = {}  # (user_id, chat_id) -> [futures]
+        self._flush_task = None
+
+    async def submit(self, user_id: int, chat_id: int) -> int:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault((user_id, chat_id), []).append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        batch, self._pending, self._flush_task = self._pending, {}, None
+        try:
+            totals = await GroupRepo.add_strikes({key: len(waiters) for key, waiters in batch.items()})
+        except Exception as e:
+            for waiters in batch.values():
+                for future in waiters:
+                    if not future.done(): future.set_exception(e)
+            return
+        for key, waiters in batch.items():
+            first = totals[key] - len(waiters) + 1
+            # A cancelled caller's strike was still written; the numbering stays as counted
+            for offset, future in enumerate(waiters):
+                if not future.done(): future.set_result(first + offset)
+
+strike_buffer = StrikeCoalescer(STRIKE_COALESCE_MS)
+
 class GroupRepo:
     @staticmethod
-    async def process_violation(user_id: int, chat_id: int):
+    async def add_strikes(counts: dict) -> dict:
+        """One INSERT ... ON CONFLICT DO UPDATE ... RETURNING for every (user_id, chat_id) in `counts`."""
+        now = utc_now()
+        stmt = pg_insert(GroupStrike).values([
+            {"user_id": user_id, "chat_id": chat_id, "strike_count": count, "last_violation": now}
+            for (user_id, chat_id), count in counts.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint="_user_chat_uc",
+            set_={"strike_count": GroupStrike.strike_count + stmt.excluded.strike_count, "last_violation": stmt.excluded.last_violation},
+        ).returning(GroupStrike.user_id, GroupStrike.chat_id, GroupStrike.strike_count)
         async with AsyncSessionLocal() as session:
-            stmt = select(GroupStrike).where(GroupStrike.user_id == user_id, GroupStrike.chat_id == chat_id)
-            record = (await session.execute(stmt)).scalar_one_or_none()
-            if not record:
-                record = GroupStrike(user_id=user_id, chat_id=chat_id, strike_count=1, last_violation=utc_now())
-                session.add(record)
-            else:
-                record.strike_count += 1
-                record.last_violation = utc_now()
+            rows = (await session.execute(stmt)).all()
             await session.commit()
-            return record.strike_count
+        return {(user_id, chat_id): strikes for user_id, chat_id, strikes in rows}
+
+    @staticmethod
+    async def process_violation(user_id: int, chat_id: int) -> int:
+        if strike_buffer.window > 0:
+            return await strike_buffer.submit(user_id, chat_id)
+        return (await GroupRepo.add_strikes({(user_id, chat_id): 1}))[(user_id, chat_id)]
+
+class JoinBuffer:
+    """Collects joins across updates for a short window and registers them in one upsert."""
+    def __init__(self, window_ms: int):
+        self.window = window_ms / 1000
+        self._pending = {}   # (chat_id, user_id) -> joined_at
+        self._inflight = []  # batches being written; a slow one may still run when the next starts
+        self._flush_task = None
+
+    def __contains__(self, key) -> bool:
+        return key in self._pending or any(key in batch for batch in self._inflight)
+
+    def add(self, chat_id: int, user_ids: list[int]):
+        now = utc_now()
+        joins = {(chat_id, user_id): now for user_id in user_ids}
+        self._pending.update(joins)
+        MemberRepo.cache_quarantine(joins)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        batch, self._pending, self._flush_task = self._pending, {}, None
+        self._inflight.append(batch)
+        try:
+            await MemberRepo.register_new_members(batch)
+        except Exception as e:
+            logger.error(f"Join batch of {len(batch)} members failed: {e}")
+        finally:
+            self._inflight.remove(batch)
+
+join_buffer = JoinBuffer(JOIN_BATCH_MS)
 
 class MemberRepo:
     @staticmethod
-    async def register_new_member(user_id: int, chat_id: int):
+    async def register_new_members(joins: dict):
+        """One multi-row INSERT ... ON CONFLICT for {(chat_id, user_id): joined_at}."""
+        if not joins: return
+        stmt = pg_insert(NewMember).values([
+            {"user_id": user_id, "chat_id": chat_id, "joined_at": joined_at}
+            for (chat_id, user_id), joined_at in joins.items()
+        ])
+        stmt = stmt.on_conflict_do_update(constraint="_new_member_chat_uc", set_={"joined_at": stmt.excluded.joined_at})
         async with AsyncSessionLocal() as session:
-            stmt = select(NewMember).where(NewMember.user_id == user_id, NewMember.chat_id == chat_id)
+            await session.execute(stmt)
+            await session.commit()
+        MemberRepo.cache_quarantine(joins)
+
+    @staticmethod
+    def cache_quarantine(joins: dict):
+        for key, joined_at in joins.items():
+            quarantine_cache[key] = quarantine_expiry(joined_at)
+
+    @staticmethod
+    async def queue_new_members(chat_id: int, user_ids: list[int]):
+        """Registers a join update, buffering it with other updates when JOIN_BATCH_MS is set."""
+        if not user_ids: return
+        if join_buffer.window > 0:
+            return join_buffer.add(chat_id, user_ids)
+        now = utc_now()
+        await MemberRepo.register_new_members({(chat_id, user_id): now for user_id in user_ids})
+
+    @staticmethod
+    async def is_restricted(user_id: int, chat_id: int) -> bool:
+        key = (chat_id, user_id)
+        if key in join_buffer: return True
+        expires = quarantine_cache.get(key)
+        if expires is not None:
+            quarantine_stats["hits"] += 1
+            return time.time() < expires
+
+        quarantine_stats["misses"] += 1
+        async with AsyncSessionLocal() as session:
+            stmt = select(NewMember.joined_at).where(NewMember.user_id == user_id, NewMember.chat_id == chat_id)
+            joined_at = (await session.execute(stmt)).scalar_one_or_none()
+        expires = quarantine_expiry(joined_at) if joined_at else 0.0
+        quarantine_cache[key] = expires
+        return time.time() < expires
+
+    @staticmethod
+    def quarantine_cache_info() -> dict:
+        lookups = quarantine_stats["hits"] + quarantine_stats["misses"]
+        return {
+            "size": len(quarantine_cache), "maxsize": quarantine_cache.maxsize,
+            **quarantine_stats, "hit_ratio": quarantine_stats["hits"] / lookups if lookups else 0.0,
+        }
+
+def quarantine_expiry(joined_at) -> float:
+    """Naive-UTC joined_at -> epoch seconds when the 24h quarantine lifts."""
+    return (joined_at + QUARANTINE_WINDOW).replace(tzinfo=timezone.utc).timestamp()
+
+class VocabRepo:
+    @staticmethod
+    def invalidate(chat_id: int | None):
+        if chat_id is None:
+            for cached_id in list(vocab_cache): VocabRepo.invalidate(cached_id)
+            return
+        vocab_versions[chat_id] = vocab_versions.get(chat_id, 0) + 1
+        vocab_cache.pop(chat_id, None)
+
+    @staticmethod
+    async def get_matcher(chat_id: int) -> ChatMatcher:
+        version = vocab_versions.get(chat_id, 0)
+        cached = vocab_cache.get(chat_id)
+        if cached and cached[0] == version: return cached[1]
+
+        async with AsyncSessionLocal() as session:
+            stmt = select(GroupWord.word, GroupWord.is_allowed).where(GroupWord.chat_id == chat_id)
+            rows = (await session.execute(stmt)).all()
+
+        matcher = DEFAULT_CHAT_MATCHER
+        if rows:
+            matcher = ChatMatcher([w for w, allowed in rows if not allowed], [w for w, allowed in rows if allowed])
+        # A write that landed while we were loading bumps the version; don't cache the stale read
+        if vocab_versions.get(chat_id, 0) == version: vocab_cache[chat_id] = (version, matcher)
+        return matcher
+
+    @staticmethod
+    async def set_word(chat_id: int, word: str, is_allowed: bool):
+        async with AsyncSessionLocal() as session:
+            stmt = select(GroupWord).where(GroupWord.chat_id == chat_id, GroupWord.word == word)
             record = (await session.execute(stmt)).scalar_one_or_none()
             if not record:
-                record = NewMember(user_id=user_id, chat_id=chat_id, joined_at=utc_now())
+                record = GroupWord(chat_id=chat_id, word=word, is_allowed=is_allowed, added_at=utc_now())
                 session.add(record)
             else:
-                record.joined_at = utc_now()
+                record.is_allowed = is_allowed
+            await cache_bus.publish(session, "vocab", chat_id)
             await session.commit()
-            quarantine_cache.pop(f"{chat_id}_{user_id}", None)
+        if is_allowed: VocabRepo._apply(chat_id, allow=word)
+        else: VocabRepo._apply(chat_id, block=word)
 
     @staticmethod
-    async def is_restricted(user_id: int, chat_id: int) -> bool:
-        cache_key = f"{chat_id}_{user_id}"
-        if quarantine_cache.get(cache_key) == "CLEARED": return False
-        
+    async def remove_word(chat_id: int, word: str) -> bool:
         async with AsyncSessionLocal() as session:
-            stmt = select(NewMember).where(NewMember.user_id == user_id, NewMember.chat_id == chat_id)
-            record = (await session.execute(stmt)).scalar_one_or_none()
-            if record and (utc_now() - record.joined_at) < timedelta(hours=24):
-                return True
-            quarantine_cache[cache_key] = "CLEARED"
-            return False
\ No newline at end of file
+            result = await session.execute(delete(GroupWord).where(GroupWord.chat_id == chat_id, GroupWord.word == word))
+            await cache_bus.publish(session, "vocab", chat_id)
+            await session.commit()
+        VocabRepo._apply(chat_id, remove=word)
+        return result.rowcount > 0
+
+    @staticmethod
+    def _apply(chat_id: int, **change):
+        """Bumps the version and patches a cached matcher in place of a full reload."""
+        cached = vocab_cache.get(chat_id)
+        version = vocab_versions.get(chat_id, 0) + 1
+        vocab_versions[chat_id] = version
+        if cached and cached[0] == version - 1:
+            vocab_cache[chat_id] = (version, cached[1].updated(**change))
+        else:
+            vocab_cache.pop(chat_id, None)
+
+class CleanupRepo:
+    """Durable copy of the alert-deletion schedule as (due epoch seconds, chat_id, message_id) entries."""
+    @staticmethod
+    async def save(entries: list[tuple[float, int, int]]):
+        if not entries: return
+        stmt = pg_insert(PendingDeletion).values([
+            {"chat_id": chat_id, "message_id": message_id, "delete_at": datetime.fromtimestamp(due, timezone.utc).replace(tzinfo=None)}
+            for due, chat_id, message_id in entries
+        ]).on_conflict_do_nothing(constraint="_pending_delete_uc")
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    @staticmethod
+    async def forget(keys: list[tuple[int, int]]):
+        if not keys: return
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(PendingDeletion).where(tuple_(PendingDeletion.chat_id, PendingDeletion.message_id).in_(keys)))
+            await session.commit()
+
+    @staticmethod
+    async def load() -> list[tuple[float, int, int]]:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(select(PendingDeletion.chat_id, PendingDeletion.message_id, PendingDeletion.delete_at))).all()
+        return [(delete_at.replace(tzinfo=timezone.utc).timestamp(), chat_id, message_id) for chat_id, message_id, delete_at in rows]
+
+class MaintenanceRepo:
+    """Small batched writes for the retention job; each call is one short transaction.
+
+    Rows are picked with FOR UPDATE SKIP LOCKED, so a batch never waits on a row the hot
+    path is upserting and another replica running the same job takes different rows.
+    """
+    @staticmethod
+    async def purge_new_members(cutoff, batch: int) -> int:
+        picked = select(NewMember.id).where(NewMember.joined_at < cutoff).limit(batch).with_for_update(skip_locked=True)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(delete(NewMember).where(NewMember.id.in_(picked)))
+            await session.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def decay_strikes(cutoff, period: timedelta, batch: int) -> int:
+        """Forgives one strike on rows quiet since `cutoff`; moving last_violation forward makes it once per period.
+
+        Banned users (3 strikes) are left alone: they can't post, so they would always look quiet,
+        and dropping below 3 would lift the AI bot's global ban.
+        """
+        picked = select(GroupStrike.id).where(
+            GroupStrike.last_violation < cutoff, GroupStrike.strike_count > 0, GroupStrike.strike_count < 3,
+        ).limit(batch).with_for_update(skip_locked=True)
+        stmt = update(GroupStrike).where(GroupStrike.id.in_(picked)).values(
+            strike_count=GroupStrike.strike_count - 1, last_violation=GroupStrike.last_violation + period,
+        )
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def purge_cleared_strikes(batch: int) -> int:
+        picked = select(GroupStrike.id).where(GroupStrike.strike_count <= 0).limit(batch).with_for_update(skip_locked=True)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(delete(GroupStrike).where(GroupStrike.id.in_(picked)))
+            await session.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def purge_hourly_stats(cutoff, batch: int) -> int:
+        key = tuple_(GroupStatsBucket.chat_id, GroupStatsBucket.granularity, GroupStatsBucket.bucket)
+        picked = select(GroupStatsBucket.chat_id, GroupStatsBucket.granularity, GroupStatsBucket.bucket).where(
+            GroupStatsBucket.granularity == "h", GroupStatsBucket.bucket < cutoff,
+        ).limit(batch).with_for_update(skip_locked=True)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(delete(GroupStatsBucket).where(key.in_(picked)))
+            await session.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def drop_event_partitions(before: date) -> int:
+        """Drops event log partitions for days before `before`: the whole day goes at once, no row deletes or vacuum."""
+        async with engine.connect() as conn:
+            names = [name for name, in await conn.execute(_EVENT_PARTITIONS, {"parent": moderation_events.name})]
+        expired = [name for name in names if name[-8:].isdigit() and datetime.strptime(name[-8:], "%Y%m%d").date() < before]
+        for name in expired:
+            async with engine.begin() as conn:
+                await conn.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+            EventRepo._partitions.discard(datetime.strptime(name[-8:], "%Y%m%d").date())
+        return len(expired)
+
+_EVENT_COLUMNS = tuple(column.name for column in moderation_events.columns)
+_EVENT_PARTITIONS = text(
+    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+    "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = :parent"
+)
+
+def _event_partition(day: date) -> str:
+    return f"{moderation_events.name}_{day:%Y%m%d}"
+
+class EventRepo:
+    """Writes to the moderation event log: COPY into the partitioned table, one partition per UTC day."""
+    _partitions = set()  # days this process has already ensured a partition for
+
+    @staticmethod
+    async def ensure_partitions(day: date):
+        """Creates the day's partition and the next one, so midnight never waits on DDL."""
+        async with engine.begin() as conn:
+            for d in (day, day + timedelta(days=1)):
+                if d in EventRepo._partitions: continue
+                await conn.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS "{_event_partition(d)}" PARTITION OF {moderation_events.name} '
+                    f"FOR VALUES FROM ('{d}') TO ('{d + timedelta(days=1)}')"
+                ))
+                EventRepo._partitions.add(d)
+
+    @staticmethod
+    async def copy_events(records: list[tuple]):
+        """`records` are tuples in moderation_events column order."""
+        for day in {record[0].date() for record in records} - EventRepo._partitions:
+            try: await EventRepo.ensure_partitions(day)
+            except Exception as e: logger.debug(f"Partition for {day} not created here (another replica may have): {e}")
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            db_stats["queries"] += 1
+            await raw.driver_connection.copy_records_to_table(moderation_events.name, records=records, columns=_EVENT_COLUMNS)
+
+STAT_FIELDS = ("deletions", "strikes", "bans", "joins", "quarantine_hits")
+
+class StatsRepo:
+    """Pre-summed /stats counters. Writes add onto the stored row, so flushes from several replicas just sum."""
+    @staticmethod
+    async def add_counts(rows: list[dict], chunk: int = 2000):
+        """`rows` are dicts of chat_id, granularity, bucket and STAT_FIELDS; each chunk is one upsert.
+
+        All chunks commit together: a failure leaves nothing applied, so the caller can retry every row.
+        """
+        async with AsyncSessionLocal() as session:
+            for i in range(0, len(rows), chunk):
+                stmt = pg_insert(GroupStatsBucket).values(rows[i:i + chunk])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["chat_id", "granularity", "bucket"],
+                    set_={field: getattr(GroupStatsBucket, field) + getattr(stmt.excluded, field) for field in STAT_FIELDS},
+                )
+                await session.execute(stmt)
+            await session.commit()
+
+    @staticmethod
+    async def get_summary(chat_ids: list[int], hours_since: datetime, days_since: datetime) -> dict:
+        """chat_id -> {"h": totals of hourly rows from `hours_since`, "d": totals of daily rows from `days_since`}.
+
+        One range scan of the primary key per chat; totals are summed in Postgres.
+        """
+        if not chat_ids: return {}
+        stmt = select(
+            GroupStatsBucket.chat_id, GroupStatsBucket.granularity,
+            *(func.sum(getattr(GroupStatsBucket, field)) for field in STAT_FIELDS),
+        ).where(
+            GroupStatsBucket.chat_id.in_(chat_ids),
+            or_(
+                and_(GroupStatsBucket.granularity == "h", GroupStatsBucket.bucket >= hours_since),
+                and_(GroupStatsBucket.granularity == "d", GroupStatsBucket.bucket >= days_since),
+            ),
+        ).group_by(GroupStatsBucket.chat_id, GroupStatsBucket.granularity)
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(stmt)).all()
+        summary = {}
+        for chat_id, granularity, *totals in rows:
+            summary.setdefault(chat_id, {})[granularity] = dict(zip(STAT_FIELDS, (int(n) for n in totals)))
+        return summary
+
+cache_bus.subscribe("settings", invalidate_settings)
+cache_bus.subscribe("vocab", VocabRepo.invalidate)
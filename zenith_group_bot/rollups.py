@@ -0,0 +1,76 @@
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from zenith_group_bot.repository import StatsRepo, STAT_FIELDS
+from core.config import STATS_FLUSH_SECONDS
+from core.metrics import registry
+
+logger = logging.getLogger("ROLLUPS")
+
+_INDEX = {field: i for i, field in enumerate(STAT_FIELDS)}
+_flushed = registry.counter("zenith_stats_rows_flushed_total", "Hourly and daily /stats rows upserted")
+
+class Rollups:
+    """Per-chat moderation counters for /stats, summed in memory off the hot path.
+
+    add() bumps a list of ints under (chat_id, hour); nothing touches the database until
+    the background task flushes every `flush_interval` seconds, upserting one hourly and
+    one daily row per chat that changed. A failed flush merges its counts back in, so the
+    next one carries them.
+    """
+    def __init__(self, flush_interval: float = STATS_FLUSH_SECONDS):
+        self.flush_interval = flush_interval
+        self._pending = {}  # (chat_id, epoch hour) -> counts in STAT_FIELDS order
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, chat_id: int, **counts: int):
+        key = (chat_id, int(time.time()) // 3600)
+        row = self._pending.get(key)
+        if row is None: row = self._pending[key] = [0] * len(STAT_FIELDS)
+        for field, n in counts.items(): row[_INDEX[field]] += n
+
+    def start(self):
+        if self._task is None: self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None: return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        if not self._pending: return
+        pending, self._pending = self._pending, {}
+        daily = {}
+        for (chat_id, hour), row in pending.items():
+            day = daily.setdefault((chat_id, hour // 24), [0] * len(STAT_FIELDS))
+            for i, n in enumerate(row): day[i] += n
+        rows = [_row(chat_id, "h", hour * 3600, counts) for (chat_id, hour), counts in pending.items()]
+        rows += [_row(chat_id, "d", day * 86400, counts) for (chat_id, day), counts in daily.items()]
+        try:
+            await StatsRepo.add_counts(rows)
+        except Exception as e:
+            logger.warning(f"⚠️ Stats flush failed, keeping {len(pending)} buckets for the next one: {e}")
+            for key, row in pending.items():
+                current = self._pending.setdefault(key, [0] * len(STAT_FIELDS))
+                for i, n in enumerate(row): current[i] += n
+            return
+        _flushed.inc(len(rows))
+
+def _row(chat_id: int, granularity: str, epoch: int, counts: list[int]) -> dict:
+    bucket = datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+    return {"chat_id": chat_id, "granularity": granularity, "bucket": bucket, **dict(zip(STAT_FIELDS, counts))}
+
+rollups = Rollups()
+registry.gauge("zenith_stats_pending_buckets", "Chat-hours of /stats counters waiting for the next flush", fn=lambda: len(rollups))
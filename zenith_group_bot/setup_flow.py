@@ -1,7 +1,12 @@
+import html
 import logging
+from datetime import timedelta
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from zenith_group_bot.repository import SettingsRepo
+from zenith_group_bot.repository import SettingsRepo, VocabRepo, StatsRepo
+from zenith_group_bot.filters import vocab_key
+from zenith_group_bot.admin_roster import admin_roster
+from utils.time_util import utc_now
 
 logger = logging.getLogger("SETUP_FLOW")
 
@@ -12,8 +17,11 @@ async def cmd_setup(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
     bot_username = context.bot.username
 
-    member = await context.bot.get_chat_member(chat_id, user_id)
-    if member.status not in ["administrator", "creator"]:
+    try: admins = await admin_roster.get(context.bot, chat_id)
+    except Exception as e:
+        logger.error(f"Failed to load admins: {e}")
+        return await update.message.reply_text("❌ Error checking permissions.")
+    if user_id not in admins:
         try: await update.message.delete()
         except: pass
         return
@@ -22,15 +30,11 @@ async def cmd_setup(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if existing and existing.is_active and existing.owner_id != user_id:
         return await update.message.reply_text(f"⚠️ This group is secured by Owner ID: {existing.owner_id}.")
 
-    try:
-        bot_member = await context.bot.get_chat_member(chat_id, context.bot.id)
-        if bot_member.status != "administrator":
-            return await update.message.reply_text("❌ Missing Permissions. Promote me to Administrator.")
-        if not bot_member.can_delete_messages or not bot_member.can_restrict_members:
-            return await update.message.reply_text("❌ Ensure I have: \n• **Delete Messages**\n• **Ban Users**", parse_mode="Markdown")
-    except Exception as e:
-        logger.error(f"Failed to check permissions: {e}")
-        return await update.message.reply_text("❌ Error checking permissions.")
+    bot_member = admins.get(context.bot.id)
+    if bot_member is None or bot_member.status != "administrator":
+        return await update.message.reply_text("❌ Missing Permissions. Promote me to Administrator.")
+    if not bot_member.can_delete_messages or not bot_member.can_restrict_members:
+        return await update.message.reply_text("❌ Ensure I have: \n• **Delete Messages**\n• **Ban Users**", parse_mode="Markdown")
 
     await SettingsRepo.upsert_settings(chat_id, user_id, update.effective_chat.title)
 
@@ -129,4 +133,64 @@ async def cmd_deletegroup(update: Update, context: ContextTypes.DEFAULT_TYPE):
     groups = await SettingsRepo.get_owned_groups(update.effective_user.id)
     if not groups: return await update.message.reply_text("You don't have any active setups.")
     keyboard = [[InlineKeyboardButton(f"🗑️ Wipe {g.group_name}", callback_data=f"del_{g.chat_id}")] for g in groups]
-    await update.message.reply_text("Select a group container to completely erase:", reply_markup=InlineKeyboardMarkup(keyboard))
\ No newline at end of file
+    await update.message.reply_text("Select a group container to completely erase:", reply_markup=InlineKeyboardMarkup(keyboard))
+
+async def cmd_vocab(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/addword, /allowword and /delword: the group owner's custom vocabulary."""
+    if update.effective_chat.type == "private": return
+    chat_id = update.effective_chat.id
+
+    settings = await SettingsRepo.get_settings(chat_id)
+    if not settings or settings.owner_id != update.effective_user.id:
+        try: await update.message.delete()
+        except: pass
+        return
+
+    command = update.message.text.split()[0].lstrip("/").split("@")[0].lower()
+    word = " ".join(context.args).strip().lower() if context.args else ""
+    if not word or not vocab_key(word) or len(word) > 64:
+        return await update.message.reply_text(f"Usage: /{command} <word or phrase>")
+
+    if command == "addword":
+        await VocabRepo.set_word(chat_id, word, is_allowed=False)
+        await update.message.reply_text(f"🚫 <b>{html.escape(word)}</b> is now blocked in this group.", parse_mode="HTML")
+    elif command == "allowword":
+        await VocabRepo.set_word(chat_id, word, is_allowed=True)
+        await update.message.reply_text(f"✅ <b>{html.escape(word)}</b> is now allowed in this group.", parse_mode="HTML")
+    elif await VocabRepo.remove_word(chat_id, word):
+        await update.message.reply_text(f"🗑️ <b>{html.escape(word)}</b> removed from this group's word list.", parse_mode="HTML")
+    else:
+        await update.message.reply_text("That word is not in this group's word list.")
+
+async def cmd_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/stats: moderation totals for the last 24 hours and 7 days, read from the pre-summed rollups.
+
+    In a group it covers that group (owner only); in private, every group the user owns.
+    """
+    if update.effective_chat.type == "private":
+        groups = {g.chat_id: g.group_name for g in await SettingsRepo.get_owned_groups(update.effective_user.id)}
+        if not groups: return await update.message.reply_text("You don't have any active setups.")
+    else:
+        settings = await SettingsRepo.get_settings(update.effective_chat.id)
+        if not settings or settings.owner_id != update.effective_user.id:
+            try: await update.message.delete()
+            except: pass
+            return
+        groups = {settings.chat_id: settings.group_name}
+
+    hour = utc_now().replace(minute=0, second=0, microsecond=0)
+    summary = await StatsRepo.get_summary(list(groups), hour - timedelta(hours=23), hour.replace(hour=0) - timedelta(days=6))
+    reply = ""
+    for chat_id, name in groups.items():
+        lines = [f"📊 <b>{html.escape(name or str(chat_id))}</b>"]
+        for label, granularity in (("24h", "h"), ("7d", "d")):
+            t = summary.get(chat_id, {}).get(granularity)
+            if not t: lines.append(f"{label}: no activity")
+            else: lines.append(
+                f"{label}: 🗑️ {t['deletions']} deleted · ⚠️ {t['strikes']} strikes · 🔨 {t['bans']} bans · "
+                f"👋 {t['joins']} joins · 🧪 {t['quarantine_hits']} quarantine hits"
+            )
+        block = "\n".join(lines)
+        if len(reply) + len(block) > 4000: break  # Telegram's message limit; whole groups only, so no tag is cut
+        reply += ("\n\n" if reply else "") + block
+    await update.message.reply_text(reply, parse_mode="HTML")
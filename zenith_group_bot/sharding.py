@@ -0,0 +1,102 @@
+import time
+import asyncio
+import logging
+import multiprocessing
+from queue import Empty
+
+logger = logging.getLogger("SHARDING")
+
+# Set once per worker process by configure(); (0, 1) means unsharded
+SHARD_INDEX, SHARD_COUNT = 0, 1
+_BATCH = 256
+_HEALTH_INTERVAL = 5.0
+
+def configure(index: int, count: int):
+    global SHARD_INDEX, SHARD_COUNT
+    SHARD_INDEX, SHARD_COUNT = index, count
+
+def shard_of(chat_id: int, count: int) -> int:
+    return chat_id % count
+
+def owns(chat_id: int) -> bool:
+    """Whether this process is responsible for the chat's in-memory state."""
+    return SHARD_COUNT == 1 or chat_id % SHARD_COUNT == SHARD_INDEX
+
+def routing_key(data: dict) -> int:
+    """The chat an update JSON belongs to (the user for chat-less updates like inline queries)."""
+    for kind, payload in data.items():
+        if not isinstance(payload, dict): continue
+        chat = payload.get("chat") or (payload.get("message") or {}).get("chat")
+        if chat: return chat["id"]
+        user = payload.get("from")
+        if user: return user["id"]
+    return 0
+
+class ShardRouter:
+    """Fans update JSON out to N worker processes by chat_id.
+
+    One multiprocessing queue per shard keeps each chat's updates in arrival order.
+    Updates are sent in batches (one pickle per loop tick) and dead workers are respawned.
+    `target(index, count, queue)` is the worker entry point; it must be importable (spawn).
+    """
+    def __init__(self, count: int, target, args: tuple = ()):
+        self.count, self.target, self.args = count, target, args
+        self._ctx = multiprocessing.get_context("spawn")
+        self._queues = [self._ctx.Queue() for _ in range(count)]
+        self._procs = [None] * count
+        self._pending = [[] for _ in range(count)]
+        self._flush_scheduled = False
+        self._health = None
+        self.stats = {"routed": 0, "batches": 0, "restarts": 0}
+
+    def start(self):
+        for index in range(self.count): self._spawn(index)
+        self._health = asyncio.create_task(self._watch())
+
+    def _spawn(self, index: int):
+        proc = self._ctx.Process(target=self.target, args=(index, self.count, self._queues[index], *self.args),
+                                 name=f"group-shard-{index}", daemon=True)
+        proc.start()
+        self._procs[index] = proc
+
+    def route(self, data: dict):
+        self._pending[shard_of(routing_key(data), self.count)].append(data)
+        self.stats["routed"] += 1
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self):
+        self._flush_scheduled = False
+        for index, pending in enumerate(self._pending):
+            for i in range(0, len(pending), _BATCH):
+                self._queues[index].put(pending[i:i + _BATCH])
+                self.stats["batches"] += 1
+            pending.clear()
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(_HEALTH_INTERVAL)
+            for index, proc in enumerate(self._procs):
+                if proc.is_alive(): continue
+                logger.error(f"Shard {index} exited with code {proc.exitcode}; respawning")
+                self.stats["restarts"] += 1
+                self._spawn(index)
+
+    async def stop(self, timeout: float = 10.0):
+        if self._health: self._health.cancel()
+        self.flush()
+        for queue in self._queues: queue.put(None)
+        deadline = time.monotonic() + timeout
+        for proc in self._procs:
+            await asyncio.to_thread(proc.join, max(0.0, deadline - time.monotonic()))
+            if proc.is_alive(): proc.terminate()
+
+async def drain(queue, handle):
+    """Worker side: feeds every routed update to `handle` until the router sends None."""
+    loop = asyncio.get_running_loop()
+    while True:
+        try: batch = await loop.run_in_executor(None, queue.get, True, 1.0)
+        except Empty: continue
+        if batch is None: return
+        for data in batch: handle(data)
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime
+from sqlalchemy import select
+
+from zenith_group_bot.models import GroupSettings, NewMember
+from zenith_group_bot.repository import (
+    AsyncSessionLocal, settings_cache, quarantine_cache, db_stats, QUARANTINE_WINDOW, quarantine_expiry,
+    settings_clock, settings_unchanged_since,
+)
+from zenith_group_bot import sharding
+from zenith_group_bot.sharding import owns
+from core.config import CACHE_SNAPSHOT_PATH, CACHE_SNAPSHOT_MAX_AGE
+from utils.time_util import utc_now
+
+logger = logging.getLogger("WARMUP")
+
+_SETTINGS_FIELDS = ("chat_id", "owner_id", "group_name", "features", "strength", "is_active", "setup_date")
+_STREAM_BATCH = 1000
+_background = set()
+
+async def load_from_db(seen: set = None) -> tuple[int, int]:
+    """Streams active settings and still-quarantined members into the caches; active chat_ids are added to `seen`."""
+    settings_count = member_count = 0
+    started = settings_clock["now"]
+    async with AsyncSessionLocal() as session:
+        stmt = select(GroupSettings).where(GroupSettings.is_active == True).execution_options(yield_per=_STREAM_BATCH)
+        async for record in await session.stream_scalars(stmt):
+            if not owns(record.chat_id) or not settings_unchanged_since(record.chat_id, started): continue
+            settings_cache[record.chat_id] = record
+            if seen is not None: seen.add(record.chat_id)
+            settings_count += 1
+
+        cutoff = utc_now() - QUARANTINE_WINDOW
+        stmt = (select(NewMember.chat_id, NewMember.user_id, NewMember.joined_at)
+                .where(NewMember.joined_at > cutoff).execution_options(yield_per=_STREAM_BATCH))
+        async for chat_id, user_id, joined_at in await session.stream(stmt):
+            if not owns(chat_id): continue
+            quarantine_cache[(chat_id, user_id)] = quarantine_expiry(joined_at)
+            member_count += 1
+    return settings_count, member_count
+
+def _snapshot_path() -> str:
+    """Each shard keeps its own snapshot, since it only caches its own chats."""
+    if not CACHE_SNAPSHOT_PATH or sharding.SHARD_COUNT == 1: return CACHE_SNAPSHOT_PATH
+    return f"{CACHE_SNAPSHOT_PATH}.{sharding.SHARD_INDEX}-of-{sharding.SHARD_COUNT}"
+
+def load_snapshot() -> tuple[int, int] | None:
+    path = _snapshot_path()
+    if not path or not os.path.exists(path): return None
+    try:
+        with open(path) as f: snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache snapshot: {e}")
+        return None
+    if time.time() - snapshot["written_at"] > CACHE_SNAPSHOT_MAX_AGE: return None
+
+    for row in snapshot["settings"]:
+        if row["setup_date"]: row["setup_date"] = datetime.fromisoformat(row["setup_date"])
+        settings_cache[row["chat_id"]] = GroupSettings(**row)
+    now = time.time()
+    members = [(chat_id, user_id, expires) for chat_id, user_id, expires in snapshot["quarantine"] if expires > now]
+    for chat_id, user_id, expires in members:
+        quarantine_cache[(chat_id, user_id)] = expires
+    return len(snapshot["settings"]), len(members)
+
+def save_snapshot():
+    """Called on shutdown; only live positive entries are worth carrying over."""
+    path = _snapshot_path()
+    if not path: return
+    now = time.time()
+    snapshot = {
+        "written_at": now,
+        "settings": [
+            {field: getattr(record, field) for field in _SETTINGS_FIELDS}
+            for record in list(settings_cache.values()) if record is not None and record.is_active
+        ],
+        "quarantine": [[chat_id, user_id, expires] for (chat_id, user_id), expires in list(quarantine_cache.items()) if expires > now],
+    }
+    for row in snapshot["settings"]:
+        if row["setup_date"]: row["setup_date"] = row["setup_date"].isoformat()
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as f: json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+        logger.info(f"💾 Cache snapshot saved ({len(snapshot['settings'])} groups, {len(snapshot['quarantine'])} quarantined)")
+    except OSError as e:
+        logger.error(f"Could not write cache snapshot: {e}")
+
+async def warm_caches():
+    """Fills the caches before polling so a restart doesn't send one query per group."""
+    start, queries = time.perf_counter(), db_stats["queries"]
+    loaded = load_snapshot()
+    if loaded:
+        source = "snapshot"
+        # The snapshot may miss edits made while we were down; reconcile without delaying startup
+        _background.add(asyncio.create_task(_refresh_in_background()))
+    else:
+        source = "database"
+        loaded = await load_from_db()
+    logger.info(f"🔥 Caches warmed from {source} in {(time.perf_counter() - start) * 1000:.0f}ms: "
+                f"{loaded[0]} groups, {loaded[1]} quarantined members, {db_stats['queries'] - queries} queries")
+
+async def _refresh_in_background():
+    restored, active = {chat_id for chat_id, record in list(settings_cache.items()) if record is not None}, set()
+    try: await load_from_db(active)
+    except Exception as e: logger.warning(f"Background cache refresh failed: {e}")
+    else:
+        # Groups deactivated or deleted while we were down; the next lookup reads their current row
+        for chat_id in restored - active: settings_cache.pop(chat_id, None)
+    finally: _background.discard(asyncio.current_task())
+
+async def report_first_minute():
+    queries = db_stats["queries"]
+    await asyncio.sleep(60)
+    logger.info(f"📊 DB queries in the first minute after startup: {db_stats['queries'] - queries}")